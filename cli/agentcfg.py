@@ -3,16 +3,40 @@
 from __future__ import annotations
 
 import argparse
+import errno
+import io
 import json
+import os
+import shutil
+import stat
 import sys
 from pathlib import Path
 from typing import TextIO
 
 from src.registry import resolve_agent_id
-from src.renderer.streaming import emit_file_footer, emit_file_header, stream_markdown_sections
-
-
-CHUNK_SIZE = 4096
+from src.renderer.cache import RenderCache
+from src.renderer.framing import write_framed_files
+from src.renderer.output import AtomicOutputFile
+from src.renderer.sections import render_section
+from src.renderer.streaming import (
+    FILE_CHUNK_SIZE,
+    FlushPolicy,
+    chunk_size_for,
+    emit_file_footer,
+    emit_file_header,
+    stream_markdown_sections,
+)
+
+
+KERNEL_COPY_MAX_BYTES = 1 << 30
+_KERNEL_COPY_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.EOPNOTSUPP,
+    errno.EBADF,
+    errno.EPERM,
+}
 WORKSPACE_MARKERS = (".git", "pyproject.toml", "package.json")
 DEFAULT_AGENT_FILES = {
     "claude": "CLAUDE.md",
@@ -33,13 +57,70 @@ def _open_output(path: str) -> TextIO:
     return open(path, "w", encoding="utf-8")
 
 
-def _stream_copy(source: TextIO, target: TextIO) -> None:
-    while True:
-        chunk = source.read(CHUNK_SIZE)
-        if chunk == "":
-            break
-        target.write(chunk)
-        target.flush()
+def _stream_copy(source: TextIO, target: TextIO, chunk_size: int) -> str:
+    """Copy ``source`` to ``target`` byte for byte and return the method used.
+
+    Between regular files the kernel copies the data (``copy_file_range``, then
+    ``sendfile``); anything else goes through ``chunk_size`` reads and writes.
+    """
+    try:
+        source_fd = source.fileno()
+        target_fd = target.fileno()
+    except (AttributeError, OSError, ValueError):
+        shutil.copyfileobj(source, target, chunk_size)
+        return "buffered"
+    target.flush()
+    method = _kernel_copy(source_fd, target_fd) or "buffered"
+    # Picks up whatever the kernel did not copy, including data appended meanwhile.
+    _buffered_fd_copy(source_fd, target_fd, chunk_size)
+    return method
+
+
+def _kernel_copy(source_fd: int, target_fd: int) -> str | None:
+    try:
+        source_stat = os.fstat(source_fd)
+        target_stat = os.fstat(target_fd)
+        remaining = source_stat.st_size - os.lseek(source_fd, 0, os.SEEK_CUR)
+    except OSError:
+        return None
+    if not (stat.S_ISREG(source_stat.st_mode) and stat.S_ISREG(target_stat.st_mode)):
+        return None
+    for method in ("copy_file_range", "sendfile"):
+        if not hasattr(os, method):
+            continue
+        try:
+            while remaining > 0:
+                count = min(remaining, KERNEL_COPY_MAX_BYTES)
+                if method == "copy_file_range":
+                    copied = os.copy_file_range(source_fd, target_fd, count)
+                else:
+                    copied = os.sendfile(target_fd, source_fd, None, count)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except OSError as exc:
+            if exc.errno not in _KERNEL_COPY_FALLBACK_ERRNOS:
+                raise
+            # File offsets reflect everything copied so far, so the next method resumes.
+            continue
+        return method
+    return None
+
+
+def _buffered_fd_copy(source_fd: int, target_fd: int, chunk_size: int) -> None:
+    while chunk := os.read(source_fd, chunk_size):
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(target_fd, view) :]
+
+
+def _write_if_changed(source: TextIO, output_path: str, chunk_size: int) -> str:
+    binary = getattr(source, "buffer", None)
+    if binary is None:
+        binary = io.BytesIO(source.read().encode("utf-8"))
+    with AtomicOutputFile(output_path) as output:
+        shutil.copyfileobj(binary, output, chunk_size)
+    return output.status.value
 
 
 def _find_workspace_root(start: Path) -> Path:
@@ -96,6 +177,13 @@ def _emit_log(args: argparse.Namespace, event: str, **fields: str) -> None:
     print(message, file=sys.stderr)
 
 
+def _report_output(args: argparse.Namespace, path: str, status: str) -> None:
+    if args.verbose or args.json_log:
+        _emit_log(args, "output", path=path, status=status)
+    else:
+        print(f"{status}: {path}", file=sys.stderr)
+
+
 def migrate_command(args: argparse.Namespace) -> int:
     try:
         input_path, output_path = _resolve_paths(args)
@@ -114,25 +202,71 @@ def migrate_command(args: argparse.Namespace) -> int:
         dry_run=str(args.dry_run),
     )
     input_stream = _open_input(input_path)
-    output_stream = sys.stdout if args.dry_run else _open_output(output_path)
+    output_stream: TextIO | None
+    if args.dry_run:
+        output_stream = sys.stdout
+    elif args.skip_unchanged and output_path != "-":
+        # Written atomically below, and only if the content changed.
+        output_stream = None
+    else:
+        output_stream = _open_output(output_path)
+    if args.chunk_size is not None:
+        chunk_size = args.chunk_size
+    elif output_stream is None:
+        chunk_size = FILE_CHUNK_SIZE
+    else:
+        chunk_size = chunk_size_for(output_stream)
     try:
         # Placeholder until the mapping/rendering pipeline is wired in.
-        _emit_log(args, "stream_start")
-        if output_stream is sys.stdout:
+        _emit_log(args, "stream_start", chunk_size=str(chunk_size))
+        if output_stream is None:
+            status = _write_if_changed(input_stream, output_path, chunk_size)
+            _report_output(args, output_path, status)
+        elif output_stream is sys.stdout and args.output_format == "framed":
+            output_stream.flush()
+            write_framed_files([(output_path, input_stream)], output_stream.buffer)
+        elif output_stream is sys.stdout:
             emit_file_header(output_stream, output_path)
-            stream_markdown_sections(input_stream, output_stream)
+            flush_policy = FlushPolicy.for_target(output_stream, every_chars=chunk_size)
+            target_agent = resolve_agent_id(args.target_agent)
+            render_cache = RenderCache(directory=args.render_cache) if args.render_cache else None
+
+            def render(section: str, complete: bool) -> str:
+                if render_cache is None:
+                    return render_section(section, target_agent)
+                return render_cache.render(section, target_agent, cacheable=complete)
+
+            stream_markdown_sections(
+                input_stream, output_stream, flush_policy=flush_policy, render=render
+            )
+            if render_cache is not None:
+                _emit_log(
+                    args,
+                    "render_cache",
+                    hits=str(render_cache.hits),
+                    misses=str(render_cache.misses),
+                    directory=str(render_cache.directory),
+                )
             emit_file_footer(output_stream, output_path)
         else:
-            _stream_copy(input_stream, output_stream)
+            method = _stream_copy(input_stream, output_stream, chunk_size)
+            _emit_log(args, "stream_copy", method=method)
         _emit_log(args, "stream_end")
     finally:
         if input_stream is not sys.stdin:
             input_stream.close()
-        if output_stream is not sys.stdout:
+        if output_stream is not None and output_stream is not sys.stdout:
             output_stream.close()
     return 0
 
 
+def _positive_int(value: str) -> int:
+    number = int(value)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("must be a positive integer")
+    return number
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(prog="agentcfg")
     subparsers = parser.add_subparsers(dest="command", required=True)
@@ -143,6 +277,12 @@ def build_parser() -> argparse.ArgumentParser:
     migrate.add_argument("--input")
     migrate.add_argument("--output")
     migrate.add_argument("--dry-run", action="store_true")
+    migrate.add_argument("--render-cache", metavar="DIR")
+    migrate.add_argument("--skip-unchanged", action="store_true")
+    migrate.add_argument("--chunk-size", type=_positive_int, metavar="BYTES")
+    migrate.add_argument(
+        "--format", dest="output_format", choices=("markers", "framed"), default="markers"
+    )
     migrate.add_argument("--verbose", action="store_true")
     migrate.add_argument("--json-log", action="store_true")
     migrate.set_defaults(func=migrate_command)
@@ -0,0 +1,94 @@
+"""Size-bounded directories of atomically written cache entries."""
+
+from __future__ import annotations
+
+import contextlib
+import os
+from pathlib import Path
+import tempfile
+
+
+def write_atomic(path: Path, data: bytes) -> None:
+    """Replace ``path`` with ``data`` through a temporary file in the same directory.
+
+    Parent directories are created as needed. On failure the temporary file is
+    removed and the ``OSError`` is re-raised.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+        os.replace(temp_path, path)
+    except BaseException:
+        with contextlib.suppress(OSError):
+            os.unlink(temp_path)
+        raise
+
+
+class CacheStore:
+    """Entries named ``<key><suffix>`` under ``directory``, evicted oldest-mtime first.
+
+    ``write`` evicts the least recently touched entries once their total size
+    exceeds ``max_bytes``. The directory is scanned on the first write and then
+    only once the bytes written since the last scan push the total past the
+    limit.
+    """
+
+    def __init__(self, directory: str | Path, *, suffix: str, max_bytes: int) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        self._directory = Path(directory)
+        self._suffix = suffix
+        self._max_bytes = max_bytes
+        # Bytes on disk as of the last eviction scan plus entries written since.
+        self._total_bytes: int | None = None
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def path_for(self, key: str) -> Path:
+        return self._directory / f"{key}{self._suffix}"
+
+    def read(self, key: str) -> bytes:
+        """Return an entry's bytes; raises ``FileNotFoundError`` when it is missing."""
+        return self.path_for(key).read_bytes()
+
+    def touch(self, key: str) -> None:
+        with contextlib.suppress(OSError):
+            os.utime(self.path_for(key))
+
+    def discard(self, key: str) -> None:
+        self.path_for(key).unlink(missing_ok=True)
+
+    def write(self, key: str, data: bytes) -> None:
+        write_atomic(self.path_for(key), data)
+        if self._total_bytes is not None:
+            self._total_bytes += len(data)
+        if self._total_bytes is None or self._total_bytes > self._max_bytes:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries: list[tuple[float, int, str]] = []
+        total = 0
+        try:
+            with os.scandir(self._directory) as scan:
+                for entry in scan:
+                    if not entry.name.endswith(self._suffix):
+                        continue
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    total += stat.st_size
+        except OSError:
+            return
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self._max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
@@ -12,7 +12,9 @@ from typing import Any, Callable, Union, get_args, get_origin, get_type_hints
 import tomllib
 from importlib import metadata
 
-from src.registry import default_registry, detect_agent_configs
+from src.parser import SectionIndex, parse_markdown
+from src.registry import DetectionIndex, default_cache_dir, default_registry
+from src.renderer.cache import RenderCache
 
 SERVER_NAME = "agentcfg-migrator"
 SERVER_DESCRIPTION = "Agent configuration migrator MCP server."
@@ -34,6 +36,7 @@ PROMPT_DEFINITIONS = (
 _LOGGER = logging.getLogger("agentcfg.mcp")
 _NONE_TYPE = type(None)
 _PRIMITIVE_SCHEMA_TYPES = {str, int, float, bool, object}
+_RENDER_CACHE = RenderCache()
 
 
 def _log_event(event: str, **fields: object) -> None:
@@ -230,7 +233,7 @@ def _init_server(FastMCP: type, metadata_payload: dict[str, Any]) -> Any:
 
 def detect_agent_config(workspace_path: str) -> dict[str, object]:
     """MCP tool for workspace detection."""
-    detections = detect_agent_configs(workspace_path)
+    detections = DetectionIndex(default_cache_dir() / "detection").detect(workspace_path)
     return {
         "workspace_path": workspace_path,
         "candidates": [detection.to_dict() for detection in detections],
@@ -238,8 +241,13 @@ def detect_agent_config(workspace_path: str) -> dict[str, object]:
 
 
 def parse_config(agent: str, files: list[str]) -> dict[str, object]:
-    """Placeholder MCP tool for parsing agent configs."""
-    return {"agent": agent, "files": files, "sections": []}
+    """MCP tool for parsing agent configs into their heading sections."""
+    sections: list[dict[str, object]] = []
+    for path in files:
+        with open(path, "r", encoding="utf-8") as handle:
+            index = SectionIndex(parse_markdown(handle))
+        sections.extend({"file": path, **section.to_dict()} for section in index.sections)
+    return {"agent": agent, "files": files, "sections": sections}
 
 
 def map_config(
@@ -257,8 +265,13 @@ def map_config(
 
 
 def render_target(target_ir: dict[str, object]) -> dict[str, object]:
-    """Placeholder MCP tool for rendering target config output."""
-    return {"target": target_ir, "files": []}
+    """MCP tool that renders each mapped section through the shared render cache."""
+    target_agent = str(target_ir.get("target_agent", ""))
+    sections = []
+    for section in target_ir.get("mapped_sections") or []:
+        source = section.get("body", "") if isinstance(section, dict) else str(section)
+        sections.append(_RENDER_CACHE.render(source, target_agent))
+    return {"target": target_ir, "files": [], "sections": sections}
 
 
 def agent_registry() -> dict[str, object]:
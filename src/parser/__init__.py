@@ -1,6 +1,17 @@
 """Parsing utilities for agent config markdown files."""
 
+from .cache import ParseCache
+from .compact import (
+    CompactMarkdown,
+    CompactNode,
+    NodeKind,
+    SourceBuffer,
+    parse_markdown_compact,
+)
+from .inline import InlineKind, InlineSpan, parse_inline
+from .mapped import MappedBuffer, parse_markdown_file
 from .markdown_ast import (
+    PARSER_VERSION,
     BlankLineNode,
     CodeBlockNode,
     HeadingNode,
@@ -8,16 +19,37 @@ from .markdown_ast import (
     ListItemNode,
     MarkdownNode,
     ParagraphNode,
+    iter_markdown,
     parse_markdown,
+    reparse,
 )
+from .parallel import parse_many
+from .sections import Section, SectionIndex
 
 __all__ = [
+    "PARSER_VERSION",
     "BlankLineNode",
     "CodeBlockNode",
+    "CompactMarkdown",
+    "CompactNode",
     "HeadingNode",
+    "InlineKind",
+    "InlineSpan",
     "ListBlockNode",
     "ListItemNode",
+    "MappedBuffer",
     "MarkdownNode",
+    "NodeKind",
     "ParagraphNode",
+    "ParseCache",
+    "Section",
+    "SectionIndex",
+    "SourceBuffer",
+    "iter_markdown",
+    "parse_inline",
+    "parse_many",
     "parse_markdown",
+    "parse_markdown_compact",
+    "parse_markdown_file",
+    "reparse",
 ]
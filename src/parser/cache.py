@@ -0,0 +1,180 @@
+"""Content-addressed on-disk cache for parsed markdown nodes."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import marshal
+from pathlib import Path
+from typing import Iterable
+import zlib
+
+from src.cache_store import CacheStore
+
+from .markdown_ast import (
+    PARSER_VERSION,
+    BlankLineNode,
+    CodeBlockNode,
+    HeadingNode,
+    ListBlockNode,
+    ListItemNode,
+    MarkdownNode,
+    ParagraphNode,
+    parse_markdown,
+)
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_ENTRY_SUFFIX = ".nodes"
+
+_HEADING = 0
+_PARAGRAPH = 1
+_LIST_BLOCK = 2
+_CODE_BLOCK = 3
+_BLANK_LINE = 4
+
+
+class ParseCache:
+    """Size-bounded LRU cache of ``parse_markdown`` results stored under ``directory``.
+
+    Entries are keyed by a digest of the source text, the parser version and the
+    marshal format, and are stored as zlib-compressed marshalled tuples. Entry
+    mtimes track recency; the oldest entries are evicted once the total size
+    exceeds ``max_bytes``.
+    """
+
+    def __init__(self, directory: str | Path, *, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self._store = CacheStore(directory, suffix=_ENTRY_SUFFIX, max_bytes=max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self) -> Path:
+        return self._store.directory
+
+    def key_for(self, text: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"agentcfg-parse:{PARSER_VERSION}:{marshal.version}\0".encode("ascii"))
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> list[MarkdownNode] | None:
+        try:
+            nodes = _decode_nodes(marshal.loads(zlib.decompress(self._store.read(key))))
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, TypeError, zlib.error) as exc:
+            path = self._store.path_for(key)
+            LOGGER.warning("Discarding unreadable parse cache entry '%s': %s", path, exc)
+            self._store.discard(key)
+            return None
+        self._store.touch(key)
+        return nodes
+
+    def set(self, key: str, nodes: Iterable[MarkdownNode]) -> None:
+        payload = zlib.compress(marshal.dumps(_encode_nodes(nodes)))
+        try:
+            self._store.write(key, payload)
+        except OSError as exc:
+            LOGGER.warning("Failed to write parse cache entry in '%s': %s", self.directory, exc)
+
+    def parse(self, source: str | Iterable[str]) -> list[MarkdownNode]:
+        text = source if isinstance(source, str) else "".join(source)
+        key = self.key_for(text)
+        nodes = self.get(key)
+        if nodes is not None:
+            self.hits += 1
+            return nodes
+        self.misses += 1
+        nodes = parse_markdown(text)
+        self.set(key, nodes)
+        return nodes
+
+
+def _encode_nodes(nodes: Iterable[MarkdownNode]) -> tuple[tuple[object, ...], ...]:
+    encoded: list[tuple[object, ...]] = []
+    for node in nodes:
+        if isinstance(node, HeadingNode):
+            encoded.append(
+                (_HEADING, node.line_start, node.line_end, node.level, node.text, node.raw_line)
+            )
+        elif isinstance(node, ParagraphNode):
+            encoded.append((_PARAGRAPH, node.line_start, node.line_end, tuple(node.lines)))
+        elif isinstance(node, ListBlockNode):
+            items = tuple(
+                (item.line_start, item.line_end, tuple(item.lines)) for item in node.items
+            )
+            encoded.append((_LIST_BLOCK, node.line_start, node.line_end, node.ordered, items))
+        elif isinstance(node, CodeBlockNode):
+            encoded.append(
+                (
+                    _CODE_BLOCK,
+                    node.line_start,
+                    node.line_end,
+                    node.fence,
+                    node.info,
+                    tuple(node.lines),
+                    node.opening_line,
+                    node.closing_line,
+                )
+            )
+        elif isinstance(node, BlankLineNode):
+            encoded.append((_BLANK_LINE, node.line_start, node.line_end, tuple(node.lines)))
+        else:
+            raise TypeError(f"unsupported node type: {type(node).__name__}")
+    return tuple(encoded)
+
+
+def _decode_nodes(payload: tuple[tuple[object, ...], ...]) -> list[MarkdownNode]:
+    nodes: list[MarkdownNode] = []
+    for record in payload:
+        tag, line_start, line_end, *fields = record
+        if tag == _HEADING:
+            level, text, raw_line = fields
+            nodes.append(
+                HeadingNode(
+                    level=level,
+                    text=text,
+                    raw_line=raw_line,
+                    line_start=line_start,
+                    line_end=line_end,
+                )
+            )
+        elif tag == _PARAGRAPH:
+            nodes.append(
+                ParagraphNode(lines=list(fields[0]), line_start=line_start, line_end=line_end)
+            )
+        elif tag == _LIST_BLOCK:
+            ordered, items = fields
+            nodes.append(
+                ListBlockNode(
+                    ordered=ordered,
+                    items=[
+                        ListItemNode(lines=list(lines), line_start=start, line_end=end)
+                        for start, end, lines in items
+                    ],
+                    line_start=line_start,
+                    line_end=line_end,
+                )
+            )
+        elif tag == _CODE_BLOCK:
+            fence, info, lines, opening_line, closing_line = fields
+            nodes.append(
+                CodeBlockNode(
+                    fence=fence,
+                    info=info,
+                    lines=list(lines),
+                    line_start=line_start,
+                    line_end=line_end,
+                    opening_line=opening_line,
+                    closing_line=closing_line,
+                )
+            )
+        elif tag == _BLANK_LINE:
+            nodes.append(
+                BlankLineNode(lines=list(fields[0]), line_start=line_start, line_end=line_end)
+            )
+        else:
+            raise ValueError(f"unknown node tag {tag!r}")
+    return nodes
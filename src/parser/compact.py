@@ -0,0 +1,327 @@
+"""Compact markdown AST backed by a shared source buffer."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from enum import Enum
+from typing import overload
+
+from .inline import InlineSpan, parse_inline
+from .markdown_ast import (
+    BlankLineNode,
+    CodeBlockNode,
+    HeadingNode,
+    ListBlockNode,
+    ListItemNode,
+    MarkdownNode,
+    ParagraphNode,
+    _classify,
+    iter_markdown,
+)
+
+
+class NodeKind(str, Enum):
+    heading = "heading"
+    paragraph = "paragraph"
+    list_block = "list_block"
+    list_item = "list_item"
+    code_block = "code_block"
+    blank_line = "blank_line"
+
+
+_KINDS = tuple(NodeKind)
+_KIND_CODES = {kind: code for code, kind in enumerate(_KINDS)}
+_LINE_NODE_TYPES = {
+    NodeKind.paragraph: ParagraphNode,
+    NodeKind.list_item: ListItemNode,
+    NodeKind.blank_line: BlankLineNode,
+}
+
+
+class SourceBuffer:
+    """Source text held once, with line offsets for 1-based line slicing."""
+
+    __slots__ = ("text", "_offsets")
+
+    def __init__(self, text: str, offsets: array) -> None:
+        self.text = text
+        self._offsets = offsets
+
+    @classmethod
+    def from_source(cls, source: str | Iterable[str]) -> SourceBuffer:
+        if isinstance(source, str):
+            text = source
+            lengths = map(len, source.splitlines(keepends=True))
+        else:
+            lines = list(source)
+            text = "".join(lines)
+            lengths = map(len, lines)
+        offsets = array("Q", [0])
+        position = 0
+        for length in lengths:
+            position += length
+            offsets.append(position)
+        return cls(text, offsets)
+
+    @property
+    def line_count(self) -> int:
+        return len(self._offsets) - 1
+
+    def offset(self, number: int) -> int:
+        return self._offsets[number - 1]
+
+    def line(self, number: int) -> str:
+        return self.text[self._offsets[number - 1] : self._offsets[number]]
+
+    def lines(self, start: int, end: int) -> list[str]:
+        return [self.line(number) for number in range(start, end)]
+
+    def iter_lines(self) -> Iterator[str]:
+        for number in range(1, len(self._offsets)):
+            yield self.line(number)
+
+
+class CompactNode:
+    """Lightweight view over one row of a ``CompactMarkdown`` table.
+
+    Exposes the same attributes as the matching dataclass node; line text is
+    sliced from the shared buffer on every access.
+    """
+
+    __slots__ = ("_table", "_row")
+
+    def __init__(self, table: CompactMarkdown, row: int) -> None:
+        self._table = table
+        self._row = row
+
+    def __repr__(self) -> str:
+        return (
+            f"CompactNode(kind={self.kind.value!r}, "
+            f"line_start={self.line_start}, line_end={self.line_end})"
+        )
+
+    @property
+    def kind(self) -> NodeKind:
+        return _KINDS[self._table._kinds[self._row]]
+
+    @property
+    def line_start(self) -> int:
+        return self._table._starts[self._row]
+
+    @property
+    def line_end(self) -> int:
+        return self._table._ends[self._row]
+
+    @property
+    def offset_start(self) -> int:
+        return self._table.buffer.offset(self.line_start)
+
+    @property
+    def offset_end(self) -> int:
+        return self._table.buffer.offset(self.line_end)
+
+    @property
+    def lines(self) -> list[str]:
+        kind = self.kind
+        if kind in _LINE_NODE_TYPES:
+            return self._table.buffer.lines(self.line_start, self.line_end)
+        if kind is NodeKind.code_block:
+            end = self.line_end - 1 if self._closed else self.line_end
+            return self._table.buffer.lines(self.line_start + 1, end)
+        raise AttributeError(f"{kind.value} nodes have no lines")
+
+    @property
+    def inline_spans(self) -> tuple[InlineSpan, ...]:
+        if self.kind not in (NodeKind.paragraph, NodeKind.list_item):
+            raise AttributeError(f"{self.kind.value} nodes have no inline spans")
+        cache = self._table._inline_spans
+        spans = cache.get(self._row)
+        if spans is None:
+            spans = cache[self._row] = parse_inline("".join(self.lines))
+        return spans
+
+    @property
+    def raw_line(self) -> str:
+        self._require(NodeKind.heading)
+        return self._table.buffer.line(self.line_start)
+
+    @property
+    def level(self) -> int:
+        self._require(NodeKind.heading)
+        return self._table._extras[self._row]
+
+    @property
+    def text(self) -> str:
+        return _classify(self.raw_line).match.group("title").strip()
+
+    @property
+    def ordered(self) -> bool:
+        self._require(NodeKind.list_block)
+        return bool(self._table._flags[self._row])
+
+    @property
+    def items(self) -> list[CompactNode]:
+        self._require(NodeKind.list_block)
+        count = self._table._extras[self._row]
+        return [CompactNode(self._table, self._row + offset) for offset in range(1, count + 1)]
+
+    @property
+    def opening_line(self) -> str:
+        self._require(NodeKind.code_block)
+        return self._table.buffer.line(self.line_start)
+
+    @property
+    def closing_line(self) -> str | None:
+        if not self._closed:
+            return None
+        return self._table.buffer.line(self.line_end - 1)
+
+    @property
+    def fence(self) -> str:
+        return _classify(self.opening_line).match.group("fence")
+
+    @property
+    def info(self) -> str | None:
+        return _classify(self.opening_line).match.group("info").strip() or None
+
+    @property
+    def _closed(self) -> bool:
+        self._require(NodeKind.code_block)
+        return bool(self._table._flags[self._row])
+
+    def _require(self, kind: NodeKind) -> None:
+        if self.kind is not kind:
+            raise AttributeError(f"{self.kind.value} nodes do not support this attribute")
+
+    def to_node(self) -> MarkdownNode:
+        kind = self.kind
+        if kind is NodeKind.heading:
+            return HeadingNode(
+                level=self.level,
+                text=self.text,
+                raw_line=self.raw_line,
+                line_start=self.line_start,
+                line_end=self.line_end,
+            )
+        if kind in _LINE_NODE_TYPES:
+            node_type = _LINE_NODE_TYPES[kind]
+            return node_type(lines=self.lines, line_start=self.line_start, line_end=self.line_end)
+        if kind is NodeKind.list_block:
+            return ListBlockNode(
+                ordered=self.ordered,
+                items=[item.to_node() for item in self.items],
+                line_start=self.line_start,
+                line_end=self.line_end,
+            )
+        return CodeBlockNode(
+            fence=self.fence,
+            info=self.info,
+            lines=self.lines,
+            line_start=self.line_start,
+            line_end=self.line_end,
+            opening_line=self.opening_line,
+            closing_line=self.closing_line,
+        )
+
+
+class CompactMarkdown(Sequence[CompactNode]):
+    """Array-backed node table; indexing yields top-level ``CompactNode`` views.
+
+    Each row stores a kind code, a line range, an extra integer (heading level or
+    list item count) and a flag (list ordered or code block closed). List items
+    occupy the rows directly after their block.
+    """
+
+    def __init__(self, buffer: SourceBuffer) -> None:
+        self.buffer = buffer
+        self._kinds = array("B")
+        self._starts = array("I")
+        self._ends = array("I")
+        self._extras = array("I")
+        self._flags = array("B")
+        self._top = array("I")
+        self._inline_spans: dict[int, tuple[InlineSpan, ...]] = {}
+
+    def __len__(self) -> int:
+        return len(self._top)
+
+    @overload
+    def __getitem__(self, index: int) -> CompactNode: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[CompactNode]: ...
+
+    def __getitem__(self, index: int | slice) -> CompactNode | list[CompactNode]:
+        if isinstance(index, slice):
+            return [CompactNode(self, row) for row in self._top[index]]
+        return CompactNode(self, self._top[index])
+
+    def to_nodes(self) -> list[MarkdownNode]:
+        return [node.to_node() for node in self]
+
+    def _append_row(
+        self,
+        kind: NodeKind,
+        line_start: int,
+        line_end: int,
+        *,
+        extra: int = 0,
+        flag: bool = False,
+    ) -> int:
+        row = len(self._kinds)
+        self._kinds.append(_KIND_CODES[kind])
+        self._starts.append(line_start)
+        self._ends.append(line_end)
+        self._extras.append(extra)
+        self._flags.append(flag)
+        return row
+
+    def _append_top_row(
+        self,
+        kind: NodeKind,
+        line_start: int,
+        line_end: int,
+        *,
+        extra: int = 0,
+        flag: bool = False,
+    ) -> int:
+        row = self._append_row(kind, line_start, line_end, extra=extra, flag=flag)
+        self._top.append(row)
+        return row
+
+    def append(self, node: MarkdownNode) -> None:
+        if isinstance(node, HeadingNode):
+            self._append_top_row(NodeKind.heading, node.line_start, node.line_end, extra=node.level)
+        elif isinstance(node, CodeBlockNode):
+            self._append_top_row(
+                NodeKind.code_block,
+                node.line_start,
+                node.line_end,
+                flag=node.closing_line is not None,
+            )
+        elif isinstance(node, ListBlockNode):
+            self._append_top_row(
+                NodeKind.list_block,
+                node.line_start,
+                node.line_end,
+                extra=len(node.items),
+                flag=node.ordered,
+            )
+            for item in node.items:
+                self._append_row(NodeKind.list_item, item.line_start, item.line_end)
+        elif isinstance(node, ParagraphNode):
+            self._append_top_row(NodeKind.paragraph, node.line_start, node.line_end)
+        elif isinstance(node, BlankLineNode):
+            self._append_top_row(NodeKind.blank_line, node.line_start, node.line_end)
+        else:
+            raise TypeError(f"unsupported node type: {type(node).__name__}")
+
+
+def parse_markdown_compact(source: str | Iterable[str]) -> CompactMarkdown:
+    """Parse ``source`` into a compact table whose nodes slice one shared buffer."""
+    buffer = SourceBuffer.from_source(source)
+    table = CompactMarkdown(buffer)
+    for node in iter_markdown(buffer.iter_lines()):
+        table.append(node)
+    return table
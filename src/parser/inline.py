@@ -0,0 +1,155 @@
+"""Inline span tokenizer for markdown block text."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from dataclasses import dataclass
+from enum import Enum
+import re
+
+_BACKTICK_RUN = re.compile(r"`+")
+
+
+class InlineKind(str, Enum):
+    code = "code"
+    link = "link"
+    emphasis = "emphasis"
+    strong = "strong"
+
+
+@dataclass(frozen=True)
+class InlineSpan:
+    kind: InlineKind
+    text: str
+    start: int
+    end: int
+    target: str | None = None
+
+
+def parse_inline(text: str) -> tuple[InlineSpan, ...]:
+    """Return code, link, emphasis and strong spans with offsets into ``text``.
+
+    Code spans are opaque. Emphasis and link labels are not scanned for nested
+    spans. Closers are never searched for twice: backtick runs are indexed by
+    length on the first backtick, the next ``]`` and ``)`` are remembered, and
+    an emphasis delimiter whose closer was not found is not searched again.
+    """
+    spans: list[InlineSpan] = []
+    missing: set[str] = set()
+    closers: dict[str, int] = {}
+    code_runs: dict[int, list[int]] | None = None
+    length = len(text)
+    index = 0
+    while index < length:
+        char = text[index]
+        if char == "\\":
+            index += 2
+            continue
+        if char == "`":
+            run = _run_length(text, index, char)
+            if code_runs is None:
+                code_runs = _backtick_runs(text)
+            span = _code_span(text, index, run, code_runs)
+            if span is None:
+                index += run
+                continue
+        elif char == "[":
+            span = _link_span(text, index, closers)
+        elif char in "*_":
+            span = _emphasis_span(text, index, missing)
+        else:
+            span = None
+        if span is None:
+            index += 1
+            continue
+        spans.append(span)
+        index = span.end
+    return tuple(spans)
+
+
+def _run_length(text: str, index: int, char: str) -> int:
+    end = index
+    while end < len(text) and text[end] == char:
+        end += 1
+    return end - index
+
+
+def _backtick_runs(text: str) -> dict[int, list[int]]:
+    # Start offsets of every maximal backtick run, grouped by run length.
+    runs: dict[int, list[int]] = {}
+    for match in _BACKTICK_RUN.finditer(text):
+        runs.setdefault(match.end() - match.start(), []).append(match.start())
+    return runs
+
+
+def _code_span(
+    text: str, index: int, run: int, code_runs: dict[int, list[int]]
+) -> InlineSpan | None:
+    starts = code_runs.get(run, ())
+    position = bisect_left(starts, index + run)
+    if position == len(starts):
+        return None
+    close = starts[position]
+    content = text[index + run : close]
+    if content.startswith(" ") and content.endswith(" ") and content.strip():
+        content = content[1:-1]
+    return InlineSpan(InlineKind.code, content, index, close + run)
+
+
+def _find_closer(text: str, char: str, start: int, closers: dict[str, int]) -> int:
+    # Searches for the same closer start at increasing offsets, so a closer found
+    # earlier (or its absence) still answers later searches up to that offset.
+    cached = closers.get(char)
+    if cached is not None and (cached == -1 or cached >= start):
+        return cached
+    closers[char] = text.find(char, start)
+    return closers[char]
+
+
+def _link_span(text: str, index: int, closers: dict[str, int]) -> InlineSpan | None:
+    label_end = _find_closer(text, "]", index + 1, closers)
+    if label_end == -1 or not text.startswith("(", label_end + 1):
+        return None
+    target_end = _find_closer(text, ")", label_end + 2, closers)
+    if target_end == -1:
+        return None
+    return InlineSpan(
+        InlineKind.link,
+        text[index + 1 : label_end],
+        index,
+        target_end + 1,
+        target=text[label_end + 2 : target_end].strip(),
+    )
+
+
+def _emphasis_span(text: str, index: int, missing: set[str]) -> InlineSpan | None:
+    char = text[index]
+    delimiter = char * min(_run_length(text, index, char), 2)
+    content_start = index + len(delimiter)
+    if not _can_open(text, index, content_start, char):
+        return None
+    search = content_start
+    while delimiter not in missing:
+        close = text.find(delimiter, search)
+        if close == -1:
+            missing.add(delimiter)
+            break
+        close_end = close + len(delimiter)
+        if close > content_start and _can_close(text, close, close_end, char):
+            kind = InlineKind.strong if len(delimiter) == 2 else InlineKind.emphasis
+            return InlineSpan(kind, text[content_start:close], index, close_end)
+        search = close + 1
+    return None
+
+
+def _can_open(text: str, index: int, content_start: int, char: str) -> bool:
+    if content_start >= len(text) or text[content_start].isspace():
+        return False
+    # Underscores inside words (snake_case identifiers) never open emphasis.
+    return not (char == "_" and index > 0 and text[index - 1].isalnum())
+
+
+def _can_close(text: str, close: int, close_end: int, char: str) -> bool:
+    if text[close - 1].isspace():
+        return False
+    return not (char == "_" and close_end < len(text) and text[close_end].isalnum())
@@ -0,0 +1,185 @@
+"""Memory-mapped, byte-level markdown parsing for very large files."""
+
+from __future__ import annotations
+
+from array import array
+import mmap
+import os
+import re
+
+from .compact import CompactMarkdown, NodeKind
+from .markdown_ast import _LineKind
+
+# Byte-level counterpart of the str classifier. Whitespace and digits are ASCII
+# only, and regexes run against the mapping with pos/endpos so lines are never
+# copied out of it.
+_LINE_RE = re.compile(
+    rb"[ \t\r\f\v]*(?:"
+    rb"(?P<fence>`{3,}|~{3,})"
+    rb"|(?P<heading>#{1,6})"
+    rb"|(?P<list_item>(?:[-+*]|(?P<number>[0-9]+)[.)])[ \t\r\f\v])"
+    rb"|(?P<text>.)"
+    rb")?",
+    re.DOTALL,
+)
+_GROUP_KINDS = {
+    None: _LineKind.blank,
+    "fence": _LineKind.fence,
+    "heading": _LineKind.heading,
+    "list_item": _LineKind.list_item,
+    "text": _LineKind.text,
+}
+_INDENT_BYTES = (ord(" "), ord("\t"))
+
+
+class MappedBuffer:
+    """Byte buffer (usually an ``mmap``) with byte offsets for 1-based line slicing.
+
+    Lines are decoded only when accessed, with ``\\r\\n`` endings normalized to
+    ``\\n`` to match text-mode reads.
+    """
+
+    __slots__ = ("data", "encoding", "_offsets")
+
+    def __init__(self, data: mmap.mmap | bytes, offsets: array, *, encoding: str = "utf-8") -> None:
+        self.data = data
+        self.encoding = encoding
+        self._offsets = offsets
+
+    @property
+    def line_count(self) -> int:
+        return len(self._offsets) - 1
+
+    def offset(self, number: int) -> int:
+        return self._offsets[number - 1]
+
+    def line(self, number: int) -> str:
+        raw = self.data[self._offsets[number - 1] : self._offsets[number]]
+        if raw.endswith(b"\r\n"):
+            raw = raw[:-2] + b"\n"
+        return raw.decode(self.encoding)
+
+    def lines(self, start: int, end: int) -> list[str]:
+        return [self.line(number) for number in range(start, end)]
+
+    def close(self) -> None:
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+
+
+class _ByteLineStream:
+    """One classified line of lookahead over a byte buffer, recording line offsets."""
+
+    def __init__(self, data: mmap.mmap | bytes, offsets: array) -> None:
+        self._data = data
+        self._size = len(data)
+        self._offsets = offsets
+        self._position = 0
+        self._next_position = 0
+        self._pending: tuple[_LineKind, re.Match[bytes]] | None = None
+        self.line_number = 1
+
+    def peek(self) -> tuple[_LineKind, re.Match[bytes]] | None:
+        if self._pending is None:
+            if self._position >= self._size:
+                return None
+            newline = self._data.find(b"\n", self._position)
+            if newline == -1:
+                content_end = self._next_position = self._size
+            else:
+                self._next_position = newline + 1
+                content_end = newline
+                if content_end > self._position and self._data[content_end - 1] == ord("\r"):
+                    content_end -= 1
+            match = _LINE_RE.match(self._data, self._position, content_end)
+            self._pending = (_GROUP_KINDS[match.lastgroup], match)
+        return self._pending
+
+    def advance(self) -> tuple[_LineKind, re.Match[bytes]]:
+        line = self.peek()
+        if line is None:
+            raise EOFError("no more lines")
+        self._pending = None
+        self._position = self._next_position
+        self._offsets.append(self._position)
+        self.line_number += 1
+        return line
+
+
+def parse_markdown_file(
+    path: str | os.PathLike[str],
+    *,
+    encoding: str = "utf-8",
+) -> CompactMarkdown:
+    """Parse a file through a read-only memory map into a ``CompactMarkdown`` table.
+
+    Line boundaries and block structure are found on raw bytes; node text is
+    decoded only when accessed, and ``offset_start``/``offset_end`` on each node
+    are byte offsets into the file.
+    """
+    with open(path, "rb") as handle:
+        try:
+            data: mmap.mmap | bytes = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped.
+            data = b""
+    offsets = array("Q", [0])
+    table = CompactMarkdown(MappedBuffer(data, offsets, encoding=encoding))
+    _scan_blocks(_ByteLineStream(data, offsets), data, table)
+    return table
+
+
+def _scan_blocks(stream: _ByteLineStream, data: mmap.mmap | bytes, table: CompactMarkdown) -> None:
+    while (line := stream.peek()) is not None:
+        kind, match = line
+        start = stream.line_number
+        if kind is _LineKind.blank:
+            while (current := stream.peek()) is not None and current[0] is _LineKind.blank:
+                stream.advance()
+            table._append_top_row(NodeKind.blank_line, start, stream.line_number)
+        elif kind is _LineKind.fence:
+            fence_char = data[match.start("fence")]
+            fence_length = match.end("fence") - match.start("fence")
+            stream.advance()
+            closed = False
+            while (current := stream.peek()) is not None:
+                stream.advance()
+                current_kind, current_match = current
+                if (
+                    current_kind is _LineKind.fence
+                    and data[current_match.start("fence")] == fence_char
+                    and current_match.end("fence") - current_match.start("fence") >= fence_length
+                ):
+                    closed = True
+                    break
+            table._append_top_row(NodeKind.code_block, start, stream.line_number, flag=closed)
+        elif kind is _LineKind.heading:
+            stream.advance()
+            level = match.end("heading") - match.start("heading")
+            table._append_top_row(NodeKind.heading, start, start + 1, extra=level)
+        elif kind is _LineKind.list_item:
+            ordered = match.start("number") != -1
+            items: list[tuple[int, int]] = []
+            while (current := stream.peek()) is not None and current[0] is _LineKind.list_item:
+                item_start = stream.line_number
+                stream.advance()
+                while (
+                    (continuation := stream.peek()) is not None
+                    and continuation[0] is _LineKind.text
+                    and data[continuation[1].pos] in _INDENT_BYTES
+                ):
+                    stream.advance()
+                items.append((item_start, stream.line_number))
+            table._append_top_row(
+                NodeKind.list_block,
+                start,
+                stream.line_number,
+                extra=len(items),
+                flag=ordered,
+            )
+            for item_start, item_end in items:
+                table._append_row(NodeKind.list_item, item_start, item_end)
+        else:
+            while (current := stream.peek()) is not None and current[0] is _LineKind.text:
+                stream.advance()
+            table._append_top_row(NodeKind.paragraph, start, stream.line_number)
@@ -1,10 +1,24 @@
-"""Minimal markdown AST parser for agent config sources."""
+"""Minimal markdown AST parser for agent config sources.
+
+Parsing is a single forward pass with one line of lookahead. Each line is
+classified once by an anchored regex with no nested quantifiers and is never
+rescanned, so parse time is O(n) in the input size; see
+``tests/parser/test_parser_performance.py`` for the enforced throughput floor.
+"""
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from bisect import bisect_left
+from dataclasses import dataclass, replace
+from enum import Enum
+from functools import cached_property
 import re
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator, NamedTuple, Sequence
+
+from .inline import InlineSpan, parse_inline
+
+# Bump whenever parsing rules or node fields change; keys persistent parse caches.
+PARSER_VERSION = "1"
 
 
 @dataclass(frozen=True)
@@ -22,6 +36,10 @@ class ParagraphNode:
     line_start: int
     line_end: int
 
+    @cached_property
+    def inline_spans(self) -> tuple[InlineSpan, ...]:
+        return parse_inline("".join(self.lines))
+
 
 @dataclass(frozen=True)
 class ListItemNode:
@@ -29,6 +47,10 @@ class ListItemNode:
     line_start: int
     line_end: int
 
+    @cached_property
+    def inline_spans(self) -> tuple[InlineSpan, ...]:
+        return parse_inline("".join(self.lines))
+
 
 @dataclass(frozen=True)
 class ListBlockNode:
@@ -66,180 +88,227 @@ MarkdownNode = (
 )
 
 
-_FENCE_RE = re.compile(r"^\s*(```+|~~~+)\s*(.*)$")
-_HEADING_RE = re.compile(r"^\s*(#{1,6})\s*(.*)$")
-_LIST_RE = re.compile(r"^\s*([-+*]|\d+[.)])\s+.*$")
-_ORDERED_RE = re.compile(r"^\s*\d+[.)]\s+.*$")
+class _LineKind(Enum):
+    blank = "blank"
+    fence = "fence"
+    heading = "heading"
+    list_item = "list_item"
+    text = "text"
 
 
-def parse_markdown(source: str | Iterable[str]) -> list[MarkdownNode]:
-    lines = _coerce_lines(source)
-    nodes: list[MarkdownNode] = []
-    i = 0
-    total = len(lines)
-
-    while i < total:
-        line = lines[i]
-        stripped = line.rstrip("\n")
-
-        if stripped.strip() == "":
-            i = _consume_blank_lines(lines, i, nodes)
-            continue
-
-        fence_match = _FENCE_RE.match(stripped)
-        if fence_match:
-            i = _consume_code_block(lines, i, nodes, fence_match)
-            continue
-
-        heading_match = _HEADING_RE.match(stripped)
-        if heading_match:
-            level = len(heading_match.group(1))
-            text = heading_match.group(2).strip()
-            nodes.append(
-                HeadingNode(level=level, text=text, raw_line=line, line_start=i + 1, line_end=i + 2)
-            )
-            i += 1
-            continue
+class _ClassifiedLine(NamedTuple):
+    text: str
+    kind: _LineKind
+    match: re.Match[str] | None
 
-        if _LIST_RE.match(stripped):
-            i = _consume_list_block(lines, i, nodes)
-            continue
 
-        i = _consume_paragraph(lines, i, nodes)
+# Alternatives are tried in fence, heading, list order against the line with its
+# leading whitespace removed; only lines starting with a marker character reach it.
+_BLOCK_RE = re.compile(
+    r"(?P<fence>```+|~~~+)\s*(?P<info>.*)"
+    r"|(?P<heading>#{1,6})\s*(?P<title>.*)"
+    r"|(?:[-+*]|(?P<number>\d+)[.)])\s+.*"
+)
+_BLOCK_MARKERS = frozenset("`~#-+*")
+
+
+def _classify(line: str) -> _ClassifiedLine:
+    content = line.rstrip("\n").lstrip()
+    if content == "":
+        return _ClassifiedLine(line, _LineKind.blank, None)
+    first = content[0]
+    if first not in _BLOCK_MARKERS and not first.isdecimal():
+        return _ClassifiedLine(line, _LineKind.text, None)
+    match = _BLOCK_RE.match(content)
+    if match is None:
+        return _ClassifiedLine(line, _LineKind.text, None)
+    if match.group("fence") is not None:
+        return _ClassifiedLine(line, _LineKind.fence, match)
+    if match.group("heading") is not None:
+        return _ClassifiedLine(line, _LineKind.heading, match)
+    return _ClassifiedLine(line, _LineKind.list_item, match)
+
+
+class _LineStream:
+    """Lazy line source with one classified line of lookahead and 1-based numbering."""
+
+    def __init__(self, lines: Iterator[str], *, line_number: int = 1) -> None:
+        self._lines = lines
+        self._pending: _ClassifiedLine | None = None
+        self.line_number = line_number
+
+    def peek(self) -> _ClassifiedLine | None:
+        if self._pending is None:
+            line = next(self._lines, None)
+            if line is None:
+                return None
+            self._pending = _classify(line)
+        return self._pending
+
+    def advance(self) -> _ClassifiedLine:
+        line = self.peek()
+        if line is None:
+            raise EOFError("no more lines")
+        self._pending = None
+        self.line_number += 1
+        return line
+
 
+def parse_markdown(source: str | Iterable[str]) -> list[MarkdownNode]:
+    return list(iter_markdown(source))
+
+
+def iter_markdown(source: str | Iterable[str]) -> Iterator[MarkdownNode]:
+    """Yield nodes as each block closes, holding only the current block in memory."""
+    return _iter_nodes(_LineStream(_iter_lines(source)))
+
+
+def reparse(
+    previous_nodes: Sequence[MarkdownNode],
+    source: str | Sequence[str],
+    edit_range: tuple[int, int],
+) -> list[MarkdownNode]:
+    """Re-parse ``source`` after a single contiguous edit, reusing unaffected nodes.
+
+    ``previous_nodes`` is the parse of the document before the edit and
+    ``edit_range`` is the half-open, 1-based ``(start, end)`` range of lines in
+    the new ``source`` that replaced the edited lines. Nodes closed before
+    ``start`` are reused as-is; parsing resumes at the first affected block and
+    stops as soon as a new block starts where a shifted old block started after
+    the edit, from which point the old nodes are reused with shifted line numbers.
+    """
+    lines = source.splitlines(keepends=True) if isinstance(source, str) else source
+    start, end = edit_range
+    old_total = previous_nodes[-1].line_end - 1 if previous_nodes else 0
+    delta = len(lines) - old_total
+    if not 1 <= start <= end <= len(lines) + 1 or end - delta < start:
+        raise ValueError(f"edit_range {edit_range!r} does not fit a {len(lines)}-line source")
+
+    # A node depends on its own lines plus the lookahead line at ``line_end``.
+    first = bisect_left(previous_nodes, start, key=lambda node: node.line_end)
+    resume = previous_nodes[first].line_start if first < len(previous_nodes) else start
+    nodes = list(previous_nodes[:first])
+    stream = _LineStream(
+        map(lines.__getitem__, range(resume - 1, len(lines))),
+        line_number=resume,
+    )
+    for node in _iter_nodes(stream):
+        if node.line_start >= end:
+            old_start = node.line_start - delta
+            index = bisect_left(previous_nodes, old_start, lo=first, key=lambda old: old.line_start)
+            if index < len(previous_nodes) and previous_nodes[index].line_start == old_start:
+                nodes.extend(_shift_node(old, delta) for old in previous_nodes[index:])
+                return nodes
+        nodes.append(node)
     return nodes
 
 
-def _coerce_lines(source: str | Iterable[str]) -> list[str]:
+def _shift_node(node: MarkdownNode, delta: int) -> MarkdownNode:
+    if delta == 0:
+        return node
+    if isinstance(node, ListBlockNode):
+        return replace(
+            node,
+            items=[_shift_node(item, delta) for item in node.items],
+            line_start=node.line_start + delta,
+            line_end=node.line_end + delta,
+        )
+    return replace(node, line_start=node.line_start + delta, line_end=node.line_end + delta)
+
+
+def _iter_nodes(stream: _LineStream) -> Iterator[MarkdownNode]:
+    while (line := stream.peek()) is not None:
+        if line.kind is _LineKind.blank:
+            yield _consume_blank_lines(stream)
+        elif line.kind is _LineKind.fence:
+            yield _consume_code_block(stream)
+        elif line.kind is _LineKind.heading:
+            line_start = stream.line_number
+            stream.advance()
+            yield HeadingNode(
+                level=len(line.match.group("heading")),
+                text=line.match.group("title").strip(),
+                raw_line=line.text,
+                line_start=line_start,
+                line_end=line_start + 1,
+            )
+        elif line.kind is _LineKind.list_item:
+            yield _consume_list_block(stream)
+        else:
+            yield _consume_paragraph(stream)
+
+
+def _iter_lines(source: str | Iterable[str]) -> Iterator[str]:
     if isinstance(source, str):
-        return source.splitlines(keepends=True)
-    return list(source)
+        return iter(source.splitlines(keepends=True))
+    return iter(source)
 
 
-def _consume_blank_lines(lines: list[str], start: int, nodes: list[MarkdownNode]) -> int:
-    i = start
+def _consume_blank_lines(stream: _LineStream) -> BlankLineNode:
+    start = stream.line_number
     blank_lines: list[str] = []
-    while i < len(lines) and lines[i].strip() == "":
-        blank_lines.append(lines[i])
-        i += 1
-    nodes.append(BlankLineNode(lines=blank_lines, line_start=start + 1, line_end=i + 1))
-    return i
-
-
-def _consume_code_block(
-    lines: list[str],
-    start: int,
-    nodes: list[MarkdownNode],
-    fence_match: re.Match[str],
-) -> int:
-    fence = fence_match.group(1)
-    info = fence_match.group(2).strip() or None
-    opening_line = lines[start]
+    while (line := stream.peek()) is not None and line.kind is _LineKind.blank:
+        blank_lines.append(stream.advance().text)
+    return BlankLineNode(lines=blank_lines, line_start=start, line_end=stream.line_number)
+
+
+def _consume_code_block(stream: _LineStream) -> CodeBlockNode:
+    start = stream.line_number
+    opening = stream.advance()
+    fence = opening.match.group("fence")
+    info = opening.match.group("info").strip() or None
     code_lines: list[str] = []
-    i = start + 1
     closing_line: str | None = None
 
-    while i < len(lines):
-        current = lines[i]
-        current_stripped = current.rstrip("\n")
-        if current_stripped.lstrip().startswith(fence):
-            closing_line = current
+    while (current := stream.peek()) is not None:
+        stream.advance()
+        if current.kind is _LineKind.fence and current.match.group("fence").startswith(fence):
+            closing_line = current.text
             break
-        code_lines.append(current)
-        i += 1
-
-    if closing_line is None:
-        nodes.append(
-            CodeBlockNode(
-                fence=fence,
-                info=info,
-                lines=code_lines,
-                line_start=start + 1,
-                line_end=len(lines) + 1,
-                opening_line=opening_line,
-                closing_line=None,
-            )
-        )
-        return len(lines)
-
-    nodes.append(
-        CodeBlockNode(
-            fence=fence,
-            info=info,
-            lines=code_lines,
-            line_start=start + 1,
-            line_end=i + 2,
-            opening_line=opening_line,
-            closing_line=closing_line,
-        )
+        code_lines.append(current.text)
+
+    return CodeBlockNode(
+        fence=fence,
+        info=info,
+        lines=code_lines,
+        line_start=start,
+        line_end=stream.line_number,
+        opening_line=opening.text,
+        closing_line=closing_line,
     )
-    return i + 1
 
 
-def _consume_list_block(lines: list[str], start: int, nodes: list[MarkdownNode]) -> int:
+def _consume_list_block(stream: _LineStream) -> ListBlockNode:
     items: list[ListItemNode] = []
-    i = start
-    ordered = _ORDERED_RE.match(lines[i].rstrip("\n")) is not None
-    while i < len(lines):
-        current = lines[i]
-        current_stripped = current.rstrip("\n")
-        if current_stripped.strip() == "":
-            break
-        if _FENCE_RE.match(current_stripped) or _HEADING_RE.match(current_stripped):
-            break
-        if _LIST_RE.match(current_stripped):
-            item_start = i
-            item_lines = [lines[i]]
-            i += 1
-            while i < len(lines):
-                continuation = lines[i]
-                continuation_stripped = continuation.rstrip("\n")
-                if continuation_stripped.strip() == "":
-                    break
-                if _FENCE_RE.match(continuation_stripped) or _HEADING_RE.match(
-                    continuation_stripped
-                ):
-                    break
-                if _LIST_RE.match(continuation_stripped):
-                    break
-                if continuation.startswith((" ", "\t")):
-                    item_lines.append(continuation)
-                    i += 1
-                    continue
-                break
-            items.append(
-                ListItemNode(
-                    lines=item_lines,
-                    line_start=item_start + 1,
-                    line_end=item_start + len(item_lines) + 1,
-                )
+    start = stream.line_number
+    ordered = stream.peek().match.group("number") is not None
+    while (current := stream.peek()) is not None and current.kind is _LineKind.list_item:
+        item_start = stream.line_number
+        item_lines = [stream.advance().text]
+        while (
+            (continuation := stream.peek()) is not None
+            and continuation.kind is _LineKind.text
+            and continuation.text.startswith((" ", "\t"))
+        ):
+            item_lines.append(stream.advance().text)
+        items.append(
+            ListItemNode(
+                lines=item_lines,
+                line_start=item_start,
+                line_end=stream.line_number,
             )
-            continue
-        break
-    nodes.append(ListBlockNode(ordered=ordered, items=items, line_start=start + 1, line_end=i + 1))
-    return i
+        )
+    return ListBlockNode(
+        ordered=ordered,
+        items=items,
+        line_start=start,
+        line_end=stream.line_number,
+    )
 
 
-def _consume_paragraph(lines: list[str], start: int, nodes: list[MarkdownNode]) -> int:
-    i = start
+def _consume_paragraph(stream: _LineStream) -> ParagraphNode:
+    start = stream.line_number
     paragraph_lines: list[str] = []
-    while i < len(lines):
-        current = lines[i]
-        current_stripped = current.rstrip("\n")
-        if current_stripped.strip() == "":
-            break
-        if _FENCE_RE.match(current_stripped) or _HEADING_RE.match(current_stripped):
-            break
-        if _LIST_RE.match(current_stripped):
-            break
-        paragraph_lines.append(current)
-        i += 1
-    if paragraph_lines:
-        nodes.append(
-            ParagraphNode(
-                lines=paragraph_lines,
-                line_start=start + 1,
-                line_end=start + len(paragraph_lines) + 1,
-            )
-        )
-    return i
+    while (current := stream.peek()) is not None and current.kind is _LineKind.text:
+        paragraph_lines.append(stream.advance().text)
+    return ParagraphNode(lines=paragraph_lines, line_start=start, line_end=stream.line_number)
@@ -0,0 +1,71 @@
+"""Parallel parsing of multi-file markdown bundles."""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import os
+from pathlib import Path
+from typing import Iterable
+
+from .markdown_ast import MarkdownNode, parse_markdown
+
+DEFAULT_BATCH_BYTES = 256 * 1024
+DEFAULT_MIN_PARALLEL_BYTES = 1024 * 1024
+
+
+def parse_many(
+    paths: Iterable[str | Path],
+    *,
+    workers: int | None = None,
+    batch_bytes: int = DEFAULT_BATCH_BYTES,
+    min_parallel_bytes: int = DEFAULT_MIN_PARALLEL_BYTES,
+) -> dict[str, list[MarkdownNode]]:
+    """Parse markdown files in a process pool, returning nodes keyed by sorted path.
+
+    Files are packed into batches of roughly ``batch_bytes`` so small files share
+    one task. Inputs totalling less than ``min_parallel_bytes``, or that fit in a
+    single batch, are parsed in-process.
+    """
+    if batch_bytes <= 0:
+        raise ValueError("batch_bytes must be positive")
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+
+    ordered = sorted({str(path) for path in paths})
+    sizes = [os.stat(path).st_size for path in ordered]
+    batches = _pack_batches(ordered, sizes, batch_bytes)
+
+    if workers == 1 or len(batches) <= 1 or sum(sizes) < min_parallel_bytes:
+        return dict(_parse_batch(ordered))
+
+    results: dict[str, list[MarkdownNode]] = {}
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches))) as executor:
+        for batch_result in executor.map(_parse_batch, batches):
+            results.update(batch_result)
+    return {path: results[path] for path in ordered}
+
+
+def _pack_batches(paths: list[str], sizes: list[int], batch_bytes: int) -> list[list[str]]:
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_bytes = 0
+    for path, size in zip(paths, sizes):
+        if current and current_bytes + size > batch_bytes:
+            batches.append(current)
+            current = []
+            current_bytes = 0
+        current.append(path)
+        current_bytes += size
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _parse_batch(paths: list[str]) -> list[tuple[str, list[MarkdownNode]]]:
+    parsed: list[tuple[str, list[MarkdownNode]]] = []
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as handle:
+            parsed.append((path, parse_markdown(handle)))
+    return parsed
@@ -0,0 +1,131 @@
+"""Heading hierarchy index over parsed markdown nodes."""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from .markdown_ast import HeadingNode, MarkdownNode
+
+
+@dataclass(frozen=True)
+class Section:
+    title: str
+    level: int
+    path: tuple[str, ...]
+    heading: HeadingNode | None
+    node_start: int
+    node_end: int
+    line_start: int
+    line_end: int
+    children: tuple[Section, ...] = ()
+
+    def to_dict(self) -> dict[str, object]:
+        return {
+            "title": self.title,
+            "level": self.level,
+            "path": list(self.path),
+            "line_start": self.line_start,
+            "line_end": self.line_end,
+        }
+
+
+@dataclass
+class _OpenSection:
+    title: str
+    level: int
+    path: tuple[str, ...]
+    heading: HeadingNode | None
+    node_start: int
+    line_start: int
+    children: list[Section] = field(default_factory=list)
+
+    def close(self, node_end: int, line_end: int) -> Section:
+        return Section(
+            title=self.title,
+            level=self.level,
+            path=self.path,
+            heading=self.heading,
+            node_start=self.node_start,
+            node_end=node_end,
+            line_start=self.line_start,
+            line_end=line_end,
+            children=tuple(self.children),
+        )
+
+
+class SectionIndex:
+    """Heading tree over a flat node list, built in one pass.
+
+    ``sections`` lists every heading section in document order, so the innermost
+    section containing a line is the last one starting at or before it. Content
+    before the first heading belongs to ``root``, a level-0 section with an
+    empty path that spans the whole document.
+    """
+
+    def __init__(self, nodes: Sequence[MarkdownNode]) -> None:
+        self.nodes = nodes
+        document_end = nodes[-1].line_end if nodes else 1
+        closed: dict[int, Section] = {}
+        stack = [_OpenSection(title="", level=0, path=(), heading=None, node_start=0, line_start=1)]
+
+        def close_top(node_end: int, line_end: int) -> Section:
+            section = stack.pop().close(node_end, line_end)
+            if stack:
+                stack[-1].children.append(section)
+                closed[section.node_start] = section
+            return section
+
+        heading_indices: list[int] = []
+        for index, node in enumerate(nodes):
+            if not isinstance(node, HeadingNode):
+                continue
+            while len(stack) > 1 and stack[-1].level >= node.level:
+                close_top(index, node.line_start)
+            stack.append(
+                _OpenSection(
+                    title=node.text,
+                    level=node.level,
+                    path=stack[-1].path + (node.text,),
+                    heading=node,
+                    node_start=index,
+                    line_start=node.line_start,
+                )
+            )
+            heading_indices.append(index)
+        while len(stack) > 1:
+            close_top(len(nodes), document_end)
+
+        self.root = close_top(len(nodes), document_end)
+        self.sections = tuple(closed[index] for index in heading_indices)
+        self._section_starts = [section.line_start for section in self.sections]
+        self._node_starts = [node.line_start for node in nodes]
+        self._paths: dict[tuple[str, ...], list[Section]] = {(): [self.root]}
+        for section in self.sections:
+            self._paths.setdefault(section.path, []).append(section)
+
+    def section_at_line(self, line: int) -> Section:
+        position = bisect_right(self._section_starts, line)
+        if position == 0:
+            return self.root
+        return self.sections[position - 1]
+
+    def node_at_line(self, line: int) -> MarkdownNode | None:
+        position = bisect_right(self._node_starts, line)
+        if position == 0:
+            return None
+        node = self.nodes[position - 1]
+        if line >= node.line_end:
+            return None
+        return node
+
+    def sections_for_path(self, path: Sequence[str]) -> list[Section]:
+        return list(self._paths.get(tuple(path), ()))
+
+    def nodes_under(self, path: Sequence[str]) -> list[MarkdownNode]:
+        nodes: list[MarkdownNode] = []
+        for section in self.sections_for_path(path):
+            body_start = section.node_start if section.heading is None else section.node_start + 1
+            nodes.extend(self.nodes[body_start : section.node_end])
+        return nodes
@@ -1,6 +1,7 @@
 """Registry data model and defaults."""
 
 from .detection import AgentDetection, AgentDetectionMatch, detect_agent_configs
+from .index import DetectionIndex, default_cache_dir
 from .models import ArtifactKind, AgentArtifact, AgentDefinition, AgentRegistry, default_registry
 from .validation import UnknownAgentError, normalize_agent_name, resolve_agent_id
 
@@ -11,7 +12,9 @@ __all__ = [
     "AgentDetectionMatch",
     "AgentDefinition",
     "AgentRegistry",
+    "DetectionIndex",
     "detect_agent_configs",
+    "default_cache_dir",
     "default_registry",
     "UnknownAgentError",
     "normalize_agent_name",
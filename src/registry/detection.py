@@ -3,12 +3,15 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import fnmatch
-import os
 from pathlib import Path
 from typing import Iterable
 
-from .models import AgentArtifact, AgentRegistry, ArtifactKind, default_registry
+from .matcher import ArtifactMatcher, compile_registry
+from .models import AgentRegistry, ArtifactKind, default_registry
+from .walk import walk_workspace
+
+# (agent_id, path, artifact pattern, artifact kind)
+FoundArtifact = tuple[str, str, str, str]
 
 DEFAULT_IGNORED_DIRS = (
     ".git",
@@ -55,47 +58,54 @@ def detect_agent_configs(
     *,
     registry: AgentRegistry | None = None,
     ignored_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+    workers: int | None = None,
 ) -> list[AgentDetection]:
     registry = registry or default_registry()
-    root = Path(workspace_path)
+    matcher = compile_registry(registry)
+    found: list[FoundArtifact] = []
+    for rel_dir, files in walk_workspace(
+        Path(workspace_path), matcher.walk_root, set(ignored_dirs), workers=workers
+    ):
+        found.extend(_directory_matches(matcher, rel_dir, files))
+    return _build_detections(registry, found)
+
+
+def _directory_matches(
+    matcher: ArtifactMatcher, rel_dir: str, files: Iterable[str]
+) -> list[FoundArtifact]:
+    found = [
+        (entry.agent_id, rel_dir, entry.artifact.pattern, entry.artifact.kind.value)
+        for entry in matcher.match_directory(rel_dir)
+    ]
+    for filename in files:
+        rel_path = filename if rel_dir == "." else f"{rel_dir}/{filename}"
+        found.extend(
+            (entry.agent_id, rel_path, entry.artifact.pattern, entry.artifact.kind.value)
+            for entry in matcher.match_file(rel_path, filename)
+        )
+    return found
+
+
+def _build_detections(
+    registry: AgentRegistry, found: Iterable[FoundArtifact]
+) -> list[AgentDetection]:
     matches_by_agent: dict[str, list[AgentDetectionMatch]] = {
         agent.agent_id: [] for agent in registry.agents
     }
     seen: set[tuple[str, str, str]] = set()
-    ignored = set(ignored_dirs)
-
-    for current_root, dirs, files in os.walk(root):
-        dirs[:] = [entry for entry in dirs if entry not in ignored]
-        current_path = Path(current_root)
-        rel_dir = _relative_posix(root, current_path)
-
-        for agent in registry.agents:
-            for artifact in agent.artifacts:
-                if artifact.kind is not ArtifactKind.directory:
-                    continue
-                if _matches_directory(rel_dir, artifact):
-                    _record_match(
-                        matches_by_agent,
-                        seen,
-                        agent_id=agent.agent_id,
-                        path=rel_dir,
-                        artifact=artifact,
-                    )
-
-        for filename in files:
-            rel_path = _relative_posix(root, current_path / filename)
-            for agent in registry.agents:
-                for artifact in agent.artifacts:
-                    if artifact.kind is ArtifactKind.directory:
-                        continue
-                    if _matches_file(rel_path, filename, artifact):
-                        _record_match(
-                            matches_by_agent,
-                            seen,
-                            agent_id=agent.agent_id,
-                            path=rel_path,
-                            artifact=artifact,
-                        )
+    for agent_id, path, pattern, kind in found:
+        signature = (agent_id, path, pattern)
+        if signature in seen:
+            continue
+        seen.add(signature)
+        matches_by_agent[agent_id].append(
+            AgentDetectionMatch(
+                path=path,
+                artifact_pattern=pattern,
+                artifact_kind=kind,
+                depth=_path_depth(path),
+            )
+        )
 
     detections: list[AgentDetection] = []
     for agent in registry.agents:
@@ -116,53 +126,6 @@ def detect_agent_configs(
     return detections
 
 
-def _matches_file(rel_path: str, filename: str, artifact: AgentArtifact) -> bool:
-    if artifact.root_only and "/" in rel_path:
-        return False
-    if artifact.kind is ArtifactKind.file:
-        if "/" in artifact.pattern or "\\" in artifact.pattern:
-            return fnmatch.fnmatch(rel_path, artifact.pattern)
-        return filename == artifact.pattern
-    if artifact.kind is ArtifactKind.glob:
-        return fnmatch.fnmatch(rel_path, artifact.pattern)
-    return False
-
-
-def _matches_directory(rel_dir: str, artifact: AgentArtifact) -> bool:
-    if artifact.kind is not ArtifactKind.directory:
-        return False
-    if rel_dir == ".":
-        return fnmatch.fnmatch("", artifact.pattern) or fnmatch.fnmatch(rel_dir, artifact.pattern)
-    return fnmatch.fnmatch(rel_dir, artifact.pattern)
-
-
-def _record_match(
-    matches_by_agent: dict[str, list[AgentDetectionMatch]],
-    seen: set[tuple[str, str, str]],
-    *,
-    agent_id: str,
-    path: str,
-    artifact: AgentArtifact,
-) -> None:
-    signature = (agent_id, path, artifact.pattern)
-    if signature in seen:
-        return
-    seen.add(signature)
-    matches_by_agent[agent_id].append(
-        AgentDetectionMatch(
-            path=path,
-            artifact_pattern=artifact.pattern,
-            artifact_kind=artifact.kind.value,
-            depth=_path_depth(path),
-        )
-    )
-
-
-def _relative_posix(root: Path, path: Path) -> str:
-    rel_path = path.relative_to(root)
-    return rel_path.as_posix()
-
-
 def _path_depth(path: str) -> int:
     if path in ("", "."):
         return 0
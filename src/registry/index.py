@@ -0,0 +1,183 @@
+"""Persistent per-workspace detection index with directory mtime invalidation."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import time
+from typing import Iterable
+
+from src.cache_store import write_atomic
+
+from .detection import (
+    DEFAULT_IGNORED_DIRS,
+    AgentDetection,
+    FoundArtifact,
+    _build_detections,
+    _directory_matches,
+)
+from .matcher import compile_registry
+from .models import AgentRegistry, default_registry
+from .walk import _scan_directory, walk_directories
+
+LOGGER = logging.getLogger(__name__)
+
+INDEX_VERSION = 1
+CACHE_DIR_ENV = "AGENTCFG_CACHE_DIR"
+# Directories modified this recently may change again within the same mtime
+# tick, so their listings are not trusted on the next run.
+RACY_WINDOW_NS = 2_000_000_000
+
+
+@dataclass(frozen=True)
+class _IndexedDirectory:
+    mtime_ns: int | None
+    subdirs: tuple[str, ...]
+    found: tuple[FoundArtifact, ...]
+    relisted: bool = False
+
+    def to_json(self) -> list[object]:
+        return [self.mtime_ns, list(self.subdirs), [list(entry) for entry in self.found]]
+
+    @classmethod
+    def from_json(cls, payload: list[object]) -> _IndexedDirectory:
+        mtime_ns, subdirs, found = payload
+        return cls(
+            mtime_ns=mtime_ns,
+            subdirs=tuple(subdirs),
+            found=tuple(tuple(entry) for entry in found),
+        )
+
+
+def default_cache_dir() -> Path:
+    configured = os.environ.get(CACHE_DIR_ENV)
+    if configured:
+        return Path(configured)
+    xdg_cache = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg_cache) if xdg_cache else Path.home() / ".cache"
+    return base / "agentcfg"
+
+
+class DetectionIndex:
+    """On-disk detection results per workspace, refreshed by directory mtime.
+
+    Each workspace gets one JSON file under ``directory``, keyed by a digest of
+    its absolute path, that records every walked directory's mtime, its
+    subdirectories and the artifacts matched in it. ``detect`` stats each
+    directory and lists only those whose mtime changed; unchanged directories
+    reuse their recorded subdirectories and matches. The index is rebuilt when
+    the registry or ignored directories change. Without ``workers``, cold runs
+    list directories on a thread pool and warm runs stat them serially.
+    """
+
+    def __init__(self, directory: str | Path) -> None:
+        self._directory = Path(directory)
+        self.relisted = 0
+        self.reused = 0
+
+    @property
+    def directory(self) -> Path:
+        return self._directory
+
+    def path_for(self, workspace_path: str | Path) -> Path:
+        root = os.fspath(Path(workspace_path).resolve())
+        digest = hashlib.sha256(root.encode("utf-8", "surrogatepass")).hexdigest()
+        return self._directory / f"{digest}.json"
+
+    def detect(
+        self,
+        workspace_path: str | Path,
+        *,
+        registry: AgentRegistry | None = None,
+        ignored_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+        workers: int | None = None,
+    ) -> list[AgentDetection]:
+        registry = registry or default_registry()
+        ignored = set(ignored_dirs)
+        root = Path(workspace_path).resolve()
+        index_path = self.path_for(root)
+        fingerprint = _fingerprint(registry, ignored)
+        previous = self._load(index_path, os.fspath(root), fingerprint)
+        if workers is None and previous:
+            # A warm index mostly stats directories, which is cheaper serially.
+            workers = 1
+        matcher = compile_registry(registry)
+        racy_after = time.time_ns() - RACY_WINDOW_NS
+
+        def scan(path: str, rel_dir: str) -> tuple[list[str], _IndexedDirectory] | None:
+            try:
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
+                return None
+            cached = previous.get(rel_dir)
+            if cached is not None and cached.mtime_ns == mtime_ns:
+                return list(cached.subdirs), cached
+            # Stat before listing: a change in between leaves a stale mtime,
+            # which only causes another listing next time.
+            listing = _scan_directory(path)
+            if listing is None:
+                return None
+            subdirs, files = listing
+            indexed = _IndexedDirectory(
+                mtime_ns=mtime_ns if mtime_ns < racy_after else None,
+                subdirs=tuple(subdirs),
+                found=tuple(_directory_matches(matcher, rel_dir, files)),
+                relisted=True,
+            )
+            return subdirs, indexed
+
+        current = dict(walk_directories(root, matcher.walk_root, ignored, scan, workers=workers))
+        relisted = sum(1 for indexed in current.values() if indexed.relisted)
+        self.relisted += relisted
+        self.reused += len(current) - relisted
+        if relisted or current.keys() != previous.keys():
+            self._save(index_path, os.fspath(root), fingerprint, current)
+        return _build_detections(
+            registry, (entry for indexed in current.values() for entry in indexed.found)
+        )
+
+    def _load(self, path: Path, root: str, fingerprint: str) -> dict[str, _IndexedDirectory]:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if (
+                payload.get("version") != INDEX_VERSION
+                or payload.get("root") != root
+                or payload.get("fingerprint") != fingerprint
+            ):
+                return {}
+            return {
+                rel_dir: _IndexedDirectory.from_json(entry)
+                for rel_dir, entry in payload["directories"].items()
+            }
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError, TypeError, KeyError, AttributeError) as exc:
+            LOGGER.warning("Discarding unreadable detection index '%s': %s", path, exc)
+            return {}
+
+    def _save(
+        self,
+        path: Path,
+        root: str,
+        fingerprint: str,
+        directories: dict[str, _IndexedDirectory],
+    ) -> None:
+        payload = {
+            "version": INDEX_VERSION,
+            "root": root,
+            "fingerprint": fingerprint,
+            "directories": {rel_dir: indexed.to_json() for rel_dir, indexed in directories.items()},
+        }
+        try:
+            write_atomic(path, json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        except OSError as exc:
+            LOGGER.warning("Failed to write detection index in '%s': %s", self._directory, exc)
+
+
+def _fingerprint(registry: AgentRegistry, ignored: set[str]) -> str:
+    payload = {"registry": registry.to_dict(), "ignored": sorted(ignored)}
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
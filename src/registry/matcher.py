@@ -0,0 +1,152 @@
+"""Compiled artifact matching for workspace detection."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import fnmatch
+from functools import lru_cache
+import os
+import re
+
+from .models import AgentArtifact, AgentRegistry, ArtifactKind
+
+_GLOB_CHARS = frozenset("*?[")
+
+
+class WalkNode:
+    """Directory in the walk plan; ``subtree`` means everything below it is walked."""
+
+    __slots__ = ("children", "subtree")
+
+    def __init__(self) -> None:
+        self.children: dict[str, WalkNode] = {}
+        self.subtree = False
+
+    def child(self, name: str) -> WalkNode | None:
+        if self.subtree:
+            return self
+        return self.children.get(os.path.normcase(name))
+
+    def add(self, components: list[str], *, subtree: bool) -> None:
+        node = self
+        for component in components:
+            if node.subtree:
+                return
+            node = node.children.setdefault(component, WalkNode())
+        if subtree:
+            node.subtree = True
+            node.children.clear()
+
+
+@dataclass(frozen=True)
+class _CompiledArtifact:
+    order: int
+    agent_id: str
+    artifact: AgentArtifact
+
+
+class ArtifactMatcher:
+    """Registry artifacts compiled into lookup tables.
+
+    Plain file names are keyed by basename. File patterns containing a path
+    separator and globs share one regex made of optional lookaheads, one named
+    group per artifact, so a single match reports every artifact that matches a
+    path. Directory artifacts get their own literal table and regex list.
+    Matches come back in registry order (agent, then artifact).
+
+    ``walk_root`` is a prefix trie of the directories a walk has to list: a
+    literal pattern needs only its own directory, a glob needs the subtree under
+    its literal prefix (``*`` also matches ``/``), and root-only artifacts need
+    only the root.
+    """
+
+    def __init__(self, registry: AgentRegistry) -> None:
+        self._by_basename: dict[str, list[_CompiledArtifact]] = {}
+        self._path_artifacts: dict[str, _CompiledArtifact] = {}
+        self._directories: dict[str, list[_CompiledArtifact]] = {}
+        self._directory_patterns: list[tuple[re.Pattern[str], _CompiledArtifact]] = []
+        path_parts: list[str] = []
+        self.walk_root = WalkNode()
+
+        order = 0
+        for agent in registry.agents:
+            for artifact in agent.artifacts:
+                compiled = _CompiledArtifact(order, agent.agent_id, artifact)
+                order += 1
+                pattern = os.path.normcase(artifact.pattern)
+                components, subtree = _walk_scope(pattern, artifact)
+                self.walk_root.add(components, subtree=subtree)
+                if artifact.kind is ArtifactKind.directory:
+                    if _GLOB_CHARS.isdisjoint(pattern):
+                        self._directories.setdefault(pattern, []).append(compiled)
+                    else:
+                        self._directory_patterns.append(
+                            (re.compile(fnmatch.translate(pattern)), compiled)
+                        )
+                elif artifact.kind is ArtifactKind.file and not (
+                    "/" in artifact.pattern or "\\" in artifact.pattern
+                ):
+                    self._by_basename.setdefault(artifact.pattern, []).append(compiled)
+                else:
+                    name = f"artifact_{compiled.order}"
+                    self._path_artifacts[name] = compiled
+                    path_parts.append(f"(?=(?P<{name}>{fnmatch.translate(pattern)}))?")
+
+        self._path_regex = re.compile("".join(path_parts)) if path_parts else None
+
+    def match_file(self, rel_path: str, filename: str) -> list[_CompiledArtifact]:
+        matches = list(self._by_basename.get(filename, ()))
+        if self._path_regex is not None:
+            match = self._path_regex.match(os.path.normcase(rel_path))
+            if match.lastindex is not None:
+                matches.extend(
+                    self._path_artifacts[name]
+                    for name, value in match.groupdict().items()
+                    if value is not None
+                )
+        if not matches:
+            return matches
+        nested = "/" in rel_path
+        matches = [entry for entry in matches if not (nested and entry.artifact.root_only)]
+        matches.sort(key=lambda entry: entry.order)
+        return matches
+
+    def match_directory(self, rel_dir: str) -> list[_CompiledArtifact]:
+        candidates = ("", rel_dir) if rel_dir == "." else (rel_dir,)
+        matches: dict[int, _CompiledArtifact] = {}
+        for candidate in candidates:
+            normalized = os.path.normcase(candidate)
+            for entry in self._directories.get(normalized, ()):
+                matches[entry.order] = entry
+            for regex, entry in self._directory_patterns:
+                if regex.match(normalized):
+                    matches[entry.order] = entry
+        return [matches[order] for order in sorted(matches)]
+
+
+def _walk_scope(pattern: str, artifact: AgentArtifact) -> tuple[list[str], bool]:
+    # Directory components an artifact can match in, and whether matches can
+    # also lie anywhere below that directory.
+    if artifact.kind is ArtifactKind.directory:
+        if pattern in ("", "."):
+            return [], False
+        if _GLOB_CHARS.isdisjoint(pattern):
+            return pattern.split("/"), False
+        return _literal_directory(pattern), True
+    if artifact.root_only:
+        return [], False
+    if artifact.kind is ArtifactKind.file and "/" not in pattern and "\\" not in pattern:
+        return [], True
+    if _GLOB_CHARS.isdisjoint(pattern):
+        return pattern.split("/")[:-1], False
+    return _literal_directory(pattern), True
+
+
+def _literal_directory(pattern: str) -> list[str]:
+    glob_start = min(pattern.find(char) for char in _GLOB_CHARS if char in pattern)
+    return pattern[:glob_start].split("/")[:-1]
+
+
+@lru_cache(maxsize=16)
+def compile_registry(registry: AgentRegistry) -> ArtifactMatcher:
+    return ArtifactMatcher(registry)
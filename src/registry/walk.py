@@ -0,0 +1,118 @@
+"""Parallel, plan-pruned directory walking for workspace detection."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Collection, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+import os
+from pathlib import Path
+from typing import TypeVar
+
+from .matcher import WalkNode
+
+DEFAULT_WALK_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+PENDING_LISTINGS_PER_WORKER = 4
+
+T = TypeVar("T")
+
+
+def walk_workspace(
+    root: str | Path,
+    plan: WalkNode,
+    ignored_dirs: Collection[str],
+    *,
+    workers: int | None = None,
+) -> Iterator[tuple[str, list[str]]]:
+    """Yield ``(rel_dir, filenames)`` for each directory the walk plan allows.
+
+    Like ``os.walk``, unreadable directories are skipped, symlinked directories
+    are not followed and are reported as neither files nor subdirectories, and
+    ``rel_dir`` is ``"."`` for the root. Directories come back in no particular
+    order.
+    """
+
+    def scan(path: str, rel_dir: str) -> tuple[list[str], list[str]] | None:
+        return _scan_directory(path)
+
+    return walk_directories(root, plan, ignored_dirs, scan, workers=workers)
+
+
+def walk_directories(
+    root: str | Path,
+    plan: WalkNode,
+    ignored_dirs: Collection[str],
+    scan: Callable[[str, str], tuple[list[str], T] | None],
+    *,
+    workers: int | None = None,
+) -> Iterator[tuple[str, T]]:
+    """Run ``scan(path, rel_dir)`` on each directory and yield ``(rel_dir, result)``.
+
+    ``scan`` returns the directory's subdirectory names and a result, or
+    ``None`` to skip the directory. Scans run on a thread pool; at most
+    ``PENDING_LISTINGS_PER_WORKER`` per worker are queued at a time, the rest
+    wait as paths.
+    """
+    if workers is None:
+        workers = DEFAULT_WALK_WORKERS
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+
+    waiting: list[tuple[str, str, WalkNode]] = [(os.fspath(root), ".", plan)]
+
+    def expand(path: str, rel_dir: str, node: WalkNode, subdirs: list[str]) -> None:
+        for name in subdirs:
+            if name in ignored_dirs:
+                continue
+            child = node.child(name)
+            if child is not None:
+                child_rel = name if rel_dir == "." else f"{rel_dir}/{name}"
+                waiting.append((os.path.join(path, name), child_rel, child))
+
+    if workers == 1:
+        while waiting:
+            path, rel_dir, node = waiting.pop()
+            scanned = scan(path, rel_dir)
+            if scanned is None:
+                continue
+            expand(path, rel_dir, node, scanned[0])
+            yield rel_dir, scanned[1]
+        return
+
+    max_pending = workers * PENDING_LISTINGS_PER_WORKER
+    running: dict[Future[tuple[list[str], T] | None], tuple[str, str, WalkNode]] = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            while waiting or running:
+                while waiting and len(running) < max_pending:
+                    path, rel_dir, node = waiting.pop()
+                    running[executor.submit(scan, path, rel_dir)] = (path, rel_dir, node)
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, rel_dir, node = running.pop(future)
+                    scanned = future.result()
+                    if scanned is None:
+                        continue
+                    expand(path, rel_dir, node, scanned[0])
+                    yield rel_dir, scanned[1]
+        finally:
+            for future in running:
+                future.cancel()
+
+
+def _scan_directory(path: str) -> tuple[list[str], list[str]] | None:
+    subdirs: list[str] = []
+    files: list[str] = []
+    try:
+        with os.scandir(path) as scan:
+            for entry in scan:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.name)
+    except OSError:
+        return None
+    return subdirs, files
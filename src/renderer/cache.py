@@ -0,0 +1,132 @@
+"""Memoization of rendered sections with an optional on-disk tier."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import logging
+from pathlib import Path
+
+from src.cache_store import CacheStore
+
+from .sections import RENDERER_VERSION, render_section
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CHARS = 16 * 1024 * 1024
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+_ENTRY_SUFFIX = ".section"
+
+
+class RenderCache:
+    """LRU cache of ``render_section`` results keyed by source digest, target agent and version.
+
+    Results totalling up to ``max_chars`` characters are kept in memory; larger
+    results are not kept at all. With a ``directory``, results are also written
+    there as UTF-8 files and memory misses are looked up on disk before
+    rendering, so repeated runs share rendered output. Disk entry mtimes track
+    recency, and the oldest entries are evicted once they exceed ``max_bytes``.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_chars: int = DEFAULT_MAX_CHARS,
+        directory: str | Path | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ) -> None:
+        if max_chars <= 0:
+            raise ValueError("max_chars must be positive")
+        self._max_chars = max_chars
+        self._store = (
+            CacheStore(directory, suffix=_ENTRY_SUFFIX, max_bytes=max_bytes)
+            if directory is not None
+            else None
+        )
+        self._entries: OrderedDict[str, str] = OrderedDict()
+        self._chars = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def directory(self) -> Path | None:
+        return self._store.directory if self._store is not None else None
+
+    def key_for(self, section: str, target_agent: str) -> str:
+        digest = hashlib.sha256()
+        digest.update(f"agentcfg-render:{RENDERER_VERSION}:{target_agent}\0".encode("utf-8"))
+        digest.update(section.encode("utf-8", "surrogatepass"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> str | None:
+        rendered = self._entries.get(key)
+        if rendered is not None:
+            self._entries.move_to_end(key)
+            return rendered
+        rendered = self._read_entry(key)
+        if rendered is not None:
+            self._remember(key, rendered)
+        return rendered
+
+    def set(self, key: str, rendered: str) -> None:
+        self._remember(key, rendered)
+        self._write_entry(key, rendered)
+
+    def render(
+        self,
+        section: str,
+        target_agent: str,
+        *,
+        cacheable: bool = True,
+    ) -> str:
+        """Render ``section``, reusing a cached result unless ``cacheable`` is false.
+
+        Parts of a section split by the streaming size limit are not worth
+        caching, since they are unlikely to repeat.
+        """
+        if not cacheable:
+            return render_section(section, target_agent)
+        key = self.key_for(section, target_agent)
+        rendered = self.get(key)
+        if rendered is not None:
+            self.hits += 1
+            return rendered
+        self.misses += 1
+        rendered = render_section(section, target_agent)
+        self.set(key, rendered)
+        return rendered
+
+    def _remember(self, key: str, rendered: str) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._chars -= len(previous)
+        if len(rendered) > self._max_chars:
+            return
+        self._entries[key] = rendered
+        self._chars += len(rendered)
+        while self._chars > self._max_chars:
+            _, evicted = self._entries.popitem(last=False)
+            self._chars -= len(evicted)
+
+    def _read_entry(self, key: str) -> str | None:
+        if self._store is None:
+            return None
+        try:
+            rendered = self._store.read(key).decode("utf-8")
+        except FileNotFoundError:
+            return None
+        except (OSError, UnicodeDecodeError) as exc:
+            path = self._store.path_for(key)
+            LOGGER.warning("Discarding unreadable render cache entry '%s': %s", path, exc)
+            self._store.discard(key)
+            return None
+        self._store.touch(key)
+        return rendered
+
+    def _write_entry(self, key: str, rendered: str) -> None:
+        if self._store is None:
+            return
+        try:
+            self._store.write(key, rendered.encode("utf-8"))
+        except OSError as exc:
+            LOGGER.warning("Failed to write render cache entry in '%s': %s", self.directory, exc)
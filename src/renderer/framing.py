@@ -0,0 +1,125 @@
+"""Length-prefixed binary framing for multi-file output."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+import hashlib
+import struct
+from typing import BinaryIO
+
+FRAME_MAGIC = b"ACF1"
+# magic, name length, payload length, sha256 digest of the payload
+_FRAME_HEADER = struct.Struct(">4sHQ32s")
+SKIP_BUFFER_SIZE = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class FrameHeader:
+    name: str
+    length: int
+    digest: bytes
+    offset: int
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.length
+
+
+def write_frame(target: BinaryIO, name: str, data: bytes) -> None:
+    encoded_name = name.encode("utf-8")
+    if len(encoded_name) > 0xFFFF:
+        raise ValueError("frame name is longer than 65535 bytes")
+    digest = hashlib.sha256(data).digest()
+    target.write(_FRAME_HEADER.pack(FRAME_MAGIC, len(encoded_name), len(data), digest))
+    target.write(encoded_name)
+    target.write(data)
+
+
+def write_framed_files(
+    files: Iterable[tuple[str, Iterable[str]]],
+    target: BinaryIO,
+    *,
+    encoding: str = "utf-8",
+) -> None:
+    for filename, source in files:
+        write_frame(target, filename, "".join(source).encode(encoding))
+    target.flush()
+
+
+def iter_frame_headers(source: BinaryIO) -> Iterator[FrameHeader]:
+    """Yield each frame header, skipping payloads without reading them when seekable."""
+    seekable = source.seekable()
+    position = source.tell() if seekable else 0
+    while (header := _read_header(source, position)) is not None:
+        yield header
+        if seekable:
+            source.seek(header.end)
+        else:
+            _discard(source, header.length)
+        position = header.end
+
+
+def iter_frames(source: BinaryIO, *, verify: bool = True) -> Iterator[tuple[FrameHeader, bytes]]:
+    position = source.tell() if source.seekable() else 0
+    while (header := _read_header(source, position)) is not None:
+        data = _read_exact(source, header.length)
+        if verify:
+            _verify(header, data)
+        yield header, data
+        position = header.end
+
+
+def read_frame(source: BinaryIO, header: FrameHeader, *, verify: bool = True) -> bytes:
+    """Read one payload from a seekable stream using a header from ``iter_frame_headers``."""
+    source.seek(header.offset)
+    data = _read_exact(source, header.length)
+    if verify:
+        _verify(header, data)
+    return data
+
+
+def _read_header(source: BinaryIO, position: int) -> FrameHeader | None:
+    raw = source.read(_FRAME_HEADER.size)
+    if raw == b"":
+        return None
+    if len(raw) < _FRAME_HEADER.size:
+        try:
+            raw += _read_exact(source, _FRAME_HEADER.size - len(raw))
+        except ValueError:
+            raise ValueError(f"truncated frame header at byte {position}") from None
+    magic, name_length, length, digest = _FRAME_HEADER.unpack(raw)
+    if magic != FRAME_MAGIC:
+        raise ValueError(f"bad frame magic at byte {position}")
+    name = _read_exact(source, name_length).decode("utf-8")
+    offset = position + _FRAME_HEADER.size + name_length
+    return FrameHeader(name=name, length=length, digest=digest, offset=offset)
+
+
+def _read_exact(source: BinaryIO, size: int) -> bytes:
+    data = source.read(size)
+    if len(data) == size:
+        return data
+    chunks = [data]
+    received = len(data)
+    while received < size:
+        chunk = source.read(size - received)
+        if not chunk:
+            raise ValueError(f"truncated frame: expected {size} bytes, got {received}")
+        chunks.append(chunk)
+        received += len(chunk)
+    return b"".join(chunks)
+
+
+def _discard(source: BinaryIO, size: int) -> None:
+    remaining = size
+    while remaining:
+        chunk = source.read(min(remaining, SKIP_BUFFER_SIZE))
+        if not chunk:
+            raise ValueError("truncated frame payload")
+        remaining -= len(chunk)
+
+
+def _verify(header: FrameHeader, data: bytes) -> None:
+    if hashlib.sha256(data).digest() != header.digest:
+        raise ValueError(f"digest mismatch for frame '{header.name}'")
@@ -0,0 +1,116 @@
+"""Atomic output files that are only replaced when their content changes."""
+
+from __future__ import annotations
+
+from enum import Enum
+import errno
+import hashlib
+import os
+from pathlib import Path
+import secrets
+import stat
+from types import TracebackType
+
+COMPARE_BUFFER_SIZE = 1024 * 1024
+
+
+class OutputStatus(str, Enum):
+    written = "written"
+    unchanged = "unchanged"
+
+
+class AtomicOutputFile:
+    """Binary writer that replaces ``path`` on ``commit`` only if the bytes differ.
+
+    Data goes to a temporary file in the target's directory and is hashed as it
+    is written. ``commit`` compares size and digest with the existing file, then
+    either renames the temporary file over it or deletes it, leaving the
+    existing file and its mtime untouched. Used as a context manager, the file
+    is committed on success and discarded if the block raises. A symlinked
+    ``path`` is resolved first, so the link is kept and its target replaced.
+    """
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path)
+        self._real_path = Path(os.path.realpath(path))
+        fd, temp_path = _create_temp(self._real_path)
+        self._handle = os.fdopen(fd, "wb")
+        self._temp_path = temp_path
+        self._digest = hashlib.sha256()
+        self._size = 0
+        self.status: OutputStatus | None = None
+
+    def write(self, data: bytes) -> int:
+        self._digest.update(data)
+        self._size += len(data)
+        return self._handle.write(data)
+
+    def flush(self) -> None:
+        self._handle.flush()
+
+    def commit(self) -> OutputStatus:
+        if self.status is not None:
+            return self.status
+        try:
+            self.status = self._replace_if_changed()
+        except BaseException:
+            self.discard()
+            raise
+        return self.status
+
+    def discard(self) -> None:
+        self._handle.close()
+        try:
+            os.unlink(self._temp_path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> AtomicOutputFile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+
+    def _replace_if_changed(self) -> OutputStatus:
+        self._handle.close()
+        try:
+            existing = os.stat(self._real_path)
+        except FileNotFoundError:
+            existing = None
+        if existing is not None and self._matches(existing):
+            self.discard()
+            return OutputStatus.unchanged
+        # The temporary file was created 0666 less the umask; keep an existing mode.
+        if existing is not None:
+            os.chmod(self._temp_path, stat.S_IMODE(existing.st_mode))
+        os.replace(self._temp_path, self._real_path)
+        return OutputStatus.written
+
+    def _matches(self, existing: os.stat_result) -> bool:
+        if not stat.S_ISREG(existing.st_mode) or existing.st_size != self._size:
+            return False
+        digest = hashlib.sha256()
+        with open(self._real_path, "rb") as handle:
+            while chunk := handle.read(COMPARE_BUFFER_SIZE):
+                digest.update(chunk)
+        return digest.digest() == self._digest.digest()
+
+
+def _create_temp(path: Path) -> tuple[int, str]:
+    # Unlike mkstemp (always 0600), O_CREAT applies the umask to 0666 as a plain
+    # open() would, without reading the process-wide umask.
+    for _ in range(100):
+        temp_path = os.path.join(path.parent, f".{path.name}.{secrets.token_hex(6)}.tmp")
+        try:
+            return os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666), temp_path
+        except FileExistsError:
+            continue
+    raise FileExistsError(errno.EEXIST, "no unused temporary file name", os.fspath(path))
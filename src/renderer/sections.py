@@ -0,0 +1,14 @@
+"""Per-section rendering for target agent output."""
+
+from __future__ import annotations
+
+RENDERER_VERSION = "1"
+
+
+def render_section(section: str, target_agent: str) -> str:
+    """Render one markdown section for ``target_agent``.
+
+    Sections pass through unchanged until the mapping pipeline produces
+    target-specific output; bump ``RENDERER_VERSION`` whenever output changes.
+    """
+    return section
@@ -2,14 +2,71 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
 import re
-from collections.abc import Iterable
-from typing import TextIO
+import stat
+import time
+from collections import deque
+from collections.abc import AsyncIterable, Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Protocol, TextIO
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None
 
 
 FILE_BEGIN_MARKER = "BEGIN FILE"
 FILE_END_MARKER = "END FILE"
 HEADING_PATTERN = re.compile(r"^#{1,6}\s")
+PIPE_FLUSH_CHARS = 64 * 1024
+PIPE_FLUSH_MS = 100.0
+DEFAULT_MAX_BUFFER_CHARS = 1024 * 1024
+DEFAULT_CHUNK_SIZE = 4096
+TTY_CHUNK_SIZE = 1024
+FILE_CHUNK_SIZE = 64 * 1024
+PIPE_CHUNK_SIZE = 64 * 1024
+_F_GETPIPE_SZ = getattr(fcntl, "F_GETPIPE_SZ", None)
+
+
+def _iov_max() -> int:
+    try:
+        value = os.sysconf("SC_IOV_MAX")
+    except (AttributeError, OSError, ValueError):
+        return 16
+    return value if value > 0 else 16
+
+
+IOV_MAX = _iov_max()
+
+
+def chunk_size_for(target: TextIO | BinaryIO) -> int:
+    """Pick a write size for ``target``: small for ttys, larger for files and pipes.
+
+    Regular files get at least ``FILE_CHUNK_SIZE`` (or their block size), pipes
+    their kernel buffer size where it can be read, and anything else, including
+    streams without a file descriptor, ``DEFAULT_CHUNK_SIZE``.
+    """
+    try:
+        if target.isatty():
+            return TTY_CHUNK_SIZE
+        fd = target.fileno()
+        status = os.fstat(fd)
+    except (AttributeError, OSError, ValueError):
+        return DEFAULT_CHUNK_SIZE
+    if stat.S_ISREG(status.st_mode):
+        return max(FILE_CHUNK_SIZE, status.st_blksize)
+    if stat.S_ISFIFO(status.st_mode):
+        if _F_GETPIPE_SZ is not None:
+            try:
+                return fcntl.fcntl(fd, _F_GETPIPE_SZ)
+            except OSError:
+                pass
+        return PIPE_CHUNK_SIZE
+    return DEFAULT_CHUNK_SIZE
 
 
 def iter_chunks(text: str, chunk_size: int) -> Iterable[str]:
@@ -20,24 +77,215 @@ def iter_chunks(text: str, chunk_size: int) -> Iterable[str]:
     return (text[index : index + chunk_size] for index in range(0, len(text), chunk_size))
 
 
+def iter_byte_chunks(data: bytes, chunk_size: int) -> Iterable[memoryview]:
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+    view = memoryview(data)
+    return (view[index : index + chunk_size] for index in range(0, len(view), chunk_size))
+
+
 class ChunkedStdoutWriter:
-    def __init__(self, target: TextIO, *, chunk_size: int = 4096) -> None:
+    """Write text in bounded chunks.
+
+    With ``bypass_text_layer``, the caller guarantees that ``target`` does not
+    translate newlines (opened with ``newline="\n"`` or ``""``, or with the
+    default on POSIX); text wrappers cannot report this themselves. Each write
+    is then encoded once and ``memoryview`` slices of the encoded buffer go
+    straight to the wrapper's binary stream, unless its encoding writes a BOM or
+    other per-call prefix. Other targets receive ``str`` chunks. Chunk sizes
+    count bytes in binary mode and characters otherwise. Without an explicit
+    ``chunk_size`` one is picked with ``chunk_size_for``.
+
+    The text layer is flushed once, when the writer is created, so text written
+    to ``target`` earlier comes first. Text written to ``target`` directly after
+    that must be flushed before the next ``write``, as ``emit_file_header`` does.
+    """
+
+    def __init__(
+        self,
+        target: TextIO,
+        *,
+        chunk_size: int | None = None,
+        bypass_text_layer: bool = False,
+    ) -> None:
+        if chunk_size is None:
+            chunk_size = chunk_size_for(target)
         if chunk_size <= 0:
             raise ValueError("chunk_size must be positive")
         self._target = target
         self._chunk_size = chunk_size
+        self._binary = _binary_stream(target) if bypass_text_layer else None
+        if self._binary is not None:
+            target.flush()
 
     @property
     def chunk_size(self) -> int:
         return self._chunk_size
 
+    @property
+    def binary(self) -> bool:
+        return self._binary is not None
+
     def write(self, text: str) -> None:
-        for chunk in iter_chunks(text, self._chunk_size):
-            self._target.write(chunk)
+        if self._binary is None:
+            for chunk in iter_chunks(text, self._chunk_size):
+                self._target.write(chunk)
+            return
+        data = text.encode(self._target.encoding, self._target.errors or "strict")
+        for chunk in iter_byte_chunks(data, self._chunk_size):
+            self._binary.write(chunk)
 
     def write_lines(self, lines: Iterable[str]) -> None:
+        fd = _raw_fd(self._binary) if self._binary is not None else None
+        if fd is None:
+            for line in lines:
+                self.write(line)
+            return
+        # Many small lines: batch them into writev calls of about chunk_size bytes,
+        # after the bytes still buffered above the file descriptor.
+        self._binary.flush()
+        encoding = self._target.encoding
+        errors = self._target.errors or "strict"
+        writer = VectoredWriter(fd, max_pending_bytes=self._chunk_size)
         for line in lines:
-            self.write(line)
+            writer.write(line.encode(encoding, errors))
+        writer.flush()
+
+
+class VectoredWriter:
+    """Collect byte fragments and write them to a file descriptor with ``os.writev``.
+
+    Fragments are sent once ``max_pending_bytes`` are queued, at most ``IOV_MAX``
+    per call, and on ``flush``. Partial writes resume from the first byte the
+    kernel did not accept.
+    """
+
+    def __init__(self, fd: int, *, max_pending_bytes: int = PIPE_FLUSH_CHARS) -> None:
+        if max_pending_bytes <= 0:
+            raise ValueError("max_pending_bytes must be positive")
+        self._fd = fd
+        self._max_pending_bytes = max_pending_bytes
+        self._pending: list[bytes | memoryview] = []
+        self._pending_bytes = 0
+
+    def write(self, data: bytes) -> None:
+        if not data:
+            return
+        self._pending.append(data)
+        self._pending_bytes += len(data)
+        if self._pending_bytes >= self._max_pending_bytes or len(self._pending) >= IOV_MAX:
+            self.flush()
+
+    def flush(self) -> None:
+        pending = self._pending
+        start = 0
+        while start < len(pending):
+            batch = pending[start : start + IOV_MAX]
+            written = _writev(self._fd, batch)
+            for fragment in batch:
+                if written < len(fragment):
+                    pending[start] = memoryview(fragment)[written:]
+                    break
+                written -= len(fragment)
+                start += 1
+        pending.clear()
+        self._pending_bytes = 0
+
+
+def _writev(fd: int, buffers: list[bytes | memoryview]) -> int:
+    if hasattr(os, "writev"):
+        return os.writev(fd, buffers)
+    return os.write(fd, b"".join(buffers))
+
+
+def _raw_fd(binary: BinaryIO) -> int | None:
+    try:
+        return binary.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+def _binary_stream(target: TextIO) -> BinaryIO | None:
+    binary = getattr(target, "buffer", None)
+    encoding = getattr(target, "encoding", None)
+    if binary is None or not isinstance(encoding, str) or not _encodes_per_call(encoding):
+        return None
+    return binary
+
+
+def _encodes_per_call(encoding: str) -> bool:
+    # Encoders that emit a BOM (utf-16, utf-8-sig) restart it on every str.encode
+    # call, so their output cannot be produced one write at a time.
+    try:
+        return "aa".encode(encoding) == "a".encode(encoding) * 2
+    except (LookupError, UnicodeError):
+        return False
+
+
+@dataclass(frozen=True)
+class FlushPolicy:
+    """When ``stream_markdown_sections`` flushes its target.
+
+    A flush happens after a section when ``every_section`` is set, when at least
+    ``every_chars`` characters were written since the last flush, or when
+    ``every_ms`` milliseconds have passed since it. The stream is always flushed
+    once at the end, so a policy with no triggers flushes only then.
+    """
+
+    every_section: bool = False
+    every_chars: int | None = None
+    every_ms: float | None = None
+
+    @classmethod
+    def per_section(cls) -> FlushPolicy:
+        return cls(every_section=True)
+
+    @classmethod
+    def at_end(cls) -> FlushPolicy:
+        return cls()
+
+    @classmethod
+    def for_target(cls, target: TextIO, *, every_chars: int = PIPE_FLUSH_CHARS) -> FlushPolicy:
+        try:
+            if target.isatty():
+                return cls.per_section()
+            mode = os.fstat(target.fileno()).st_mode
+        except (AttributeError, OSError, ValueError):
+            return cls.per_section()
+        if stat.S_ISREG(mode):
+            return cls.at_end()
+        return cls(every_chars=every_chars, every_ms=PIPE_FLUSH_MS)
+
+
+class _SectionFlusher:
+    def __init__(self, target: TextIO, policy: FlushPolicy, now_fn: Callable[[], float]) -> None:
+        self._target = target
+        self._policy = policy
+        self._now = now_fn
+        self._pending = 0
+        self._last_flush = now_fn()
+
+    def section_written(self, size: int) -> None:
+        self._pending += size
+        policy = self._policy
+        if (
+            policy.every_section
+            or (policy.every_chars is not None and self._pending >= policy.every_chars)
+            or (
+                policy.every_ms is not None
+                and (self._now() - self._last_flush) * 1000 >= policy.every_ms
+            )
+        ):
+            self._flush()
+
+    def finish(self) -> None:
+        if self._pending:
+            self._flush()
+
+    def _flush(self) -> None:
+        self._target.flush()
+        self._pending = 0
+        self._last_flush = self._now()
 
 
 def emit_file_header(target: TextIO, filename: str) -> None:
@@ -50,30 +298,217 @@ def emit_file_footer(target: TextIO, filename: str) -> None:
     target.flush()
 
 
-def stream_markdown_sections(source: Iterable[str], target: TextIO) -> None:
-    buffer: list[str] = []
-    in_code_block = False
+class _SectionSplitter:
+    """Group lines into sections that each start at a heading outside a code fence.
 
-    def flush_buffer() -> None:
-        if not buffer:
-            return
-        target.write("".join(buffer))
-        target.flush()
-        buffer.clear()
+    A section that would grow past ``max_buffer_chars`` is emitted in parts, so
+    at most that many characters (plus one line) are held at a time. ``complete``
+    tells whether the last section returned was whole or one of those parts.
+    """
 
-    for line in source:
-        stripped = line.strip()
-        if stripped.startswith("```"):
-            in_code_block = not in_code_block
-        if not in_code_block and HEADING_PATTERN.match(line):
-            flush_buffer()
-        buffer.append(line)
+    def __init__(self, max_buffer_chars: int | None = None) -> None:
+        if max_buffer_chars is not None and max_buffer_chars <= 0:
+            raise ValueError("max_buffer_chars must be positive")
+        self._max_buffer_chars = max_buffer_chars
+        self._buffer: list[str] = []
+        self._buffered_chars = 0
+        self._in_code_block = False
+        self._continued = False
+        self.complete = True
 
-    flush_buffer()
+    def feed(self, line: str) -> str | None:
+        section = None
+        if line.strip().startswith("```"):
+            self._in_code_block = not self._in_code_block
+        at_heading = not self._in_code_block and HEADING_PATTERN.match(line) is not None
+        if at_heading or (
+            self._max_buffer_chars is not None
+            and self._buffered_chars + len(line) > self._max_buffer_chars
+        ):
+            section = self._take(split=not at_heading)
+        self._buffer.append(line)
+        self._buffered_chars += len(line)
+        return section
 
+    def finish(self) -> str | None:
+        return self._take(split=False)
 
-def stream_markdown_files(files: Iterable[tuple[str, Iterable[str]]], target: TextIO) -> None:
-    for filename, source in files:
+    def _take(self, *, split: bool) -> str | None:
+        if not self._buffer:
+            return None
+        section = "".join(self._buffer)
+        self._buffer.clear()
+        self._buffered_chars = 0
+        self.complete = not (split or self._continued)
+        self._continued = split
+        return section
+
+
+class AsyncByteWriter(Protocol):
+    """The subset of ``asyncio.StreamWriter`` the async renderers write to."""
+
+    def write(self, data: bytes) -> None: ...
+
+    async def drain(self) -> None: ...
+
+
+def stream_markdown_sections(
+    source: Iterable[str],
+    target: TextIO,
+    *,
+    flush_policy: FlushPolicy | None = None,
+    now_fn: Callable[[], float] = time.monotonic,
+    max_buffer_chars: int | None = DEFAULT_MAX_BUFFER_CHARS,
+    render: Callable[[str, bool], str] | None = None,
+) -> None:
+    """Write ``source`` to ``target`` one heading section at a time.
+
+    ``render``, if given, is called with each section and whether it is whole
+    (``False`` for the parts of a section split at ``max_buffer_chars``) and
+    its result is written instead.
+    """
+    if render is None:
+        sections = _iter_sections(source, max_buffer_chars)
+    else:
+        sections = (
+            render(section, complete)
+            for section, complete in _iter_section_parts(source, max_buffer_chars)
+        )
+    _write_sections(sections, target, flush_policy, now_fn)
+
+
+def stream_markdown_files(
+    files: Iterable[tuple[str, Iterable[str]]],
+    target: TextIO,
+    *,
+    flush_policy: FlushPolicy | None = None,
+    workers: int = 1,
+    max_pending: int | None = None,
+    max_buffer_chars: int | None = DEFAULT_MAX_BUFFER_CHARS,
+) -> None:
+    """Write each file between ``BEGIN FILE``/``END FILE`` markers in input order.
+
+    With ``workers`` above one, sources are read and split into sections on a
+    thread pool while earlier files are written. This helps when reading the
+    sources blocks on I/O (slow disks, network streams, pipes), since those
+    waits overlap. It does not help CPU-bound work: section splitting holds the
+    GIL, so sources already in memory gain nothing. Each file in flight is held
+    in memory until it is written, and at most ``max_pending`` files (default
+    ``2 * workers``) are in flight or waiting.
+    """
+    if workers <= 0:
+        raise ValueError("workers must be positive")
+    if max_pending is None:
+        max_pending = 2 * workers
+    if max_pending <= 0:
+        raise ValueError("max_pending must be positive")
+
+    if workers == 1:
+        for filename, source in files:
+            emit_file_header(target, filename)
+            stream_markdown_sections(
+                source, target, flush_policy=flush_policy, max_buffer_chars=max_buffer_chars
+            )
+            emit_file_footer(target, filename)
+        return
+
+    pending: deque[tuple[str, Future[list[str]]]] = deque()
+
+    def emit_next() -> None:
+        filename, rendered = pending.popleft()
+        sections = rendered.result()
         emit_file_header(target, filename)
-        stream_markdown_sections(source, target)
+        _write_sections(sections, target, flush_policy, time.monotonic)
         emit_file_footer(target, filename)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        try:
+            for filename, source in files:
+                if len(pending) >= max_pending:
+                    emit_next()
+                rendered = executor.submit(_render_sections, source, max_buffer_chars)
+                pending.append((filename, rendered))
+            while pending:
+                emit_next()
+        finally:
+            for _, rendered in pending:
+                rendered.cancel()
+
+
+def _iter_sections(source: Iterable[str], max_buffer_chars: int | None = None) -> Iterator[str]:
+    return (section for section, _ in _iter_section_parts(source, max_buffer_chars))
+
+
+def _iter_section_parts(
+    source: Iterable[str], max_buffer_chars: int | None
+) -> Iterator[tuple[str, bool]]:
+    splitter = _SectionSplitter(max_buffer_chars)
+    for line in source:
+        section = splitter.feed(line)
+        if section is not None:
+            yield section, splitter.complete
+    section = splitter.finish()
+    if section is not None:
+        yield section, splitter.complete
+
+
+def _render_sections(source: Iterable[str], max_buffer_chars: int | None) -> list[str]:
+    return list(_iter_sections(source, max_buffer_chars))
+
+
+def _write_sections(
+    sections: Iterable[str],
+    target: TextIO,
+    flush_policy: FlushPolicy | None,
+    now_fn: Callable[[], float],
+) -> None:
+    flusher = _SectionFlusher(target, flush_policy or FlushPolicy.for_target(target), now_fn)
+    for section in sections:
+        target.write(section)
+        flusher.section_written(len(section))
+    flusher.finish()
+
+
+async def async_stream_markdown_sections(
+    source: Iterable[str] | AsyncIterable[str],
+    writer: AsyncByteWriter,
+    *,
+    encoding: str = "utf-8",
+    max_buffer_chars: int | None = DEFAULT_MAX_BUFFER_CHARS,
+) -> None:
+    """Write sections to ``writer``, awaiting ``drain()`` after each one.
+
+    Draining lets a slow reader pause the render, and control returns to the
+    event loop between sections even when the writer's buffer never fills.
+    """
+    splitter = _SectionSplitter(max_buffer_chars)
+
+    async def write_section(section: str | None) -> None:
+        if section is None:
+            return
+        writer.write(section.encode(encoding))
+        await writer.drain()
+        await asyncio.sleep(0)
+
+    if isinstance(source, AsyncIterable):
+        async for line in source:
+            await write_section(splitter.feed(line))
+    else:
+        for line in source:
+            await write_section(splitter.feed(line))
+
+    await write_section(splitter.finish())
+
+
+async def async_stream_markdown_files(
+    files: Iterable[tuple[str, Iterable[str] | AsyncIterable[str]]],
+    writer: AsyncByteWriter,
+    *,
+    encoding: str = "utf-8",
+) -> None:
+    for filename, source in files:
+        writer.write(f"{FILE_BEGIN_MARKER} {filename}\n".encode(encoding))
+        await writer.drain()
+        await async_stream_markdown_sections(source, writer, encoding=encoding)
+        writer.write(f"{FILE_END_MARKER} {filename}\n".encode(encoding))
+        await writer.drain()
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from src.cache_store import CacheStore, write_atomic
+
+
+def test_write_atomic_removes_temporary_file_on_failure(tmp_path, monkeypatch):
+    def fail_replace(source, target):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+
+    with pytest.raises(OSError):
+        write_atomic(tmp_path / "entry.bin", b"data")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_store_evicts_oldest_entries_past_max_bytes(tmp_path):
+    store = CacheStore(tmp_path, suffix=".bin", max_bytes=10)
+
+    store.write("old", b"12345")
+    os.utime(store.path_for("old"), (1, 1))
+    store.write("new", b"12345")
+    os.utime(store.path_for("new"), (2, 2))
+    store.touch("old")
+    store.write("newest", b"12345")
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["newest.bin", "old.bin"]
+    assert store.read("old") == b"12345"
+
+
+def test_cache_store_read_raises_for_missing_entries(tmp_path):
+    store = CacheStore(tmp_path, suffix=".bin", max_bytes=10)
+
+    with pytest.raises(FileNotFoundError):
+        store.read("missing")
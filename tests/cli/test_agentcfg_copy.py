@@ -0,0 +1,131 @@
+import errno
+import io
+import json
+import os
+
+from cli import agentcfg
+from tests.cli.test_agentcfg_stdio import run_agentcfg
+
+
+CONTENT = ("# Rules\r\nUse tabs ✓\n" * 50_000).encode("utf-8")
+
+
+def _copy(tmp_path):
+    source = tmp_path / "source.md"
+    source.write_bytes(CONTENT)
+    target = tmp_path / "target.md"
+    with open(source, "r", encoding="utf-8") as reader:
+        with open(target, "w", encoding="utf-8") as writer:
+            method = agentcfg._stream_copy(reader, writer, 64 * 1024)
+    return method, target.read_bytes()
+
+
+def test_stream_copy_between_files_is_byte_exact(tmp_path):
+    method, copied = _copy(tmp_path)
+
+    assert method in {"copy_file_range", "sendfile", "buffered"}
+    assert copied == CONTENT
+
+
+def test_stream_copy_falls_back_when_kernel_copy_is_unsupported(tmp_path, monkeypatch):
+    def unsupported(*args):
+        raise OSError(errno.EXDEV, "cross-device")
+
+    monkeypatch.setattr(os, "copy_file_range", unsupported, raising=False)
+    monkeypatch.setattr(os, "sendfile", unsupported, raising=False)
+
+    method, copied = _copy(tmp_path)
+
+    assert method == "buffered"
+    assert copied == CONTENT
+
+
+def test_stream_copy_without_file_descriptors_uses_buffered_copy():
+    target = io.StringIO()
+
+    assert agentcfg._stream_copy(io.StringIO("text\n"), target, 2) == "buffered"
+    assert target.getvalue() == "text\n"
+
+
+def test_migrate_file_output_logs_copy_method(tmp_path):
+    source = tmp_path / "source.md"
+    source.write_bytes(CONTENT)
+    output = tmp_path / "AGENTS.md"
+    result = run_agentcfg(
+        [
+            "migrate",
+            "--from",
+            "claude",
+            "--to",
+            "codex",
+            "--input",
+            str(source),
+            "--output",
+            str(output),
+            "--json-log",
+        ]
+    )
+
+    assert result.returncode == 0
+    assert output.read_bytes() == CONTENT
+    events = [json.loads(line) for line in result.stderr.strip().splitlines()]
+    assert [event["event"] for event in events] == [
+        "resolved_paths",
+        "stream_start",
+        "stream_copy",
+        "stream_end",
+    ]
+
+
+def test_migrate_skip_unchanged_reports_written_then_unchanged(tmp_path):
+    source = tmp_path / "source.md"
+    source.write_text("# Rules\nkeep\n", encoding="utf-8")
+    output = tmp_path / "AGENTS.md"
+    args = [
+        "migrate",
+        "--from",
+        "claude",
+        "--to",
+        "codex",
+        "--input",
+        str(source),
+        "--output",
+        str(output),
+        "--skip-unchanged",
+    ]
+
+    first = run_agentcfg(args)
+    os.utime(output, (1_000_000, 1_000_000))
+    second = run_agentcfg(args)
+
+    assert first.returncode == 0
+    assert first.stderr == f"written: {output}\n"
+    assert second.stderr == f"unchanged: {output}\n"
+    assert output.read_text(encoding="utf-8") == "# Rules\nkeep\n"
+    assert output.stat().st_mtime == 1_000_000
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["AGENTS.md", "source.md"]
+
+
+def test_migrate_json_log_reports_chunk_size_and_override(tmp_path):
+    source = tmp_path / "source.md"
+    source.write_text("# Rules\n", encoding="utf-8")
+    args = [
+        "migrate",
+        "--from",
+        "claude",
+        "--to",
+        "codex",
+        "--input",
+        str(source),
+        "--output",
+        str(tmp_path / "AGENTS.md"),
+        "--json-log",
+    ]
+
+    def chunk_size(result):
+        events = [json.loads(line) for line in result.stderr.strip().splitlines()]
+        return next(event["chunk_size"] for event in events if event["event"] == "stream_start")
+
+    assert int(chunk_size(run_agentcfg(args))) >= 64 * 1024
+    assert chunk_size(run_agentcfg([*args, "--chunk-size", "8192"])) == "8192"
+    assert run_agentcfg([*args, "--chunk-size", "0"]).returncode == 2
@@ -1,20 +1,23 @@
+import io
 import json
 import os
 import subprocess
 import sys
 from pathlib import Path
 
+from src.renderer.framing import iter_frames
+
 
 REPO_ROOT = Path(__file__).resolve().parents[2]
 
 
-def run_agentcfg(args, *, stdin_text=None, cwd=None):
+def run_agentcfg(args, *, stdin_text=None, cwd=None, text=True):
     env = os.environ.copy()
     env["PYTHONPATH"] = str(REPO_ROOT)
     return subprocess.run(
         [sys.executable, "-m", "cli.agentcfg", *args],
         input=stdin_text,
-        text=True,
+        text=text,
         capture_output=True,
         cwd=cwd or REPO_ROOT,
         env=env,
@@ -169,3 +172,64 @@ def test_migrate_rejects_unknown_agents(tmp_path):
 
     assert result.returncode == 2
     assert "unknown agent" in result.stderr
+
+
+def test_migrate_dry_run_framed_format(tmp_path):
+    source = tmp_path / "source.md"
+    source.write_text("END FILE x\nbody ✓\n", encoding="utf-8")
+    output = tmp_path / "AGENTS.md"
+    result = run_agentcfg(
+        [
+            "migrate",
+            "--from",
+            "claude",
+            "--to",
+            "codex",
+            "--input",
+            str(source),
+            "--output",
+            str(output),
+            "--dry-run",
+            "--format",
+            "framed",
+        ],
+        text=False,
+    )
+
+    assert result.returncode == 0
+    frames = list(iter_frames(io.BytesIO(result.stdout)))
+    assert [(header.name, data) for header, data in frames] == [
+        (str(output), "END FILE x\nbody ✓\n".encode("utf-8"))
+    ]
+    assert not output.exists()
+
+
+def test_migrate_render_cache_reports_hits_on_repeat_run(tmp_path):
+    source = tmp_path / "source.md"
+    source.write_text("# Title\nbody\n## Part\nmore\n", encoding="utf-8")
+    args = [
+        "migrate",
+        "--from",
+        "claude",
+        "--to",
+        "codex",
+        "--input",
+        str(source),
+        "--output",
+        "-",
+        "--json-log",
+        "--render-cache",
+        str(tmp_path / "render-cache"),
+    ]
+
+    first = run_agentcfg(args)
+    second = run_agentcfg(args)
+
+    expected = "BEGIN FILE -\n# Title\nbody\n## Part\nmore\nEND FILE -\n"
+    assert first.stdout == second.stdout == expected
+    counts = []
+    for result in (first, second):
+        events = [json.loads(line) for line in result.stderr.strip().splitlines()]
+        cache_event = next(event for event in events if event["event"] == "render_cache")
+        counts.append((cache_event["hits"], cache_event["misses"]))
+    assert counts == [("0", "2"), ("2", "0")]
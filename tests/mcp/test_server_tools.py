@@ -38,3 +38,48 @@ def test_register_tools_falls_back_to_direct_registration() -> None:
     mcp_server._register_tools(server)
 
     assert server.tools == [name for name, _ in mcp_server.TOOL_DEFINITIONS]
+
+
+def test_parse_config_returns_heading_sections(tmp_path) -> None:
+    config = tmp_path / "AGENTS.md"
+    config.write_text("Intro\n# Setup\n## Tests\nRun pytest\n# Style\n", encoding="utf-8")
+
+    result = mcp_server.parse_config("codex", [str(config)])
+
+    sections = result["sections"]
+    assert {section["file"] for section in sections} == {str(config)}
+    assert [
+        (section["path"], section["level"], section["line_start"], section["line_end"])
+        for section in sections
+    ] == [
+        (["Setup"], 1, 2, 5),
+        (["Setup", "Tests"], 2, 3, 5),
+        (["Style"], 1, 5, 6),
+    ]
+
+
+def test_render_target_renders_mapped_sections_through_cache() -> None:
+    target_ir = {
+        "target_agent": "codex",
+        "mapped_sections": ["# Rules\nbody\n", {"body": "## Style\ntabs\n"}],
+    }
+    hits = mcp_server._RENDER_CACHE.hits
+
+    first = mcp_server.render_target(target_ir)
+    second = mcp_server.render_target(target_ir)
+
+    assert first["sections"] == ["# Rules\nbody\n", "## Style\ntabs\n"]
+    assert second["sections"] == first["sections"]
+    assert mcp_server._RENDER_CACHE.hits == hits + 2
+
+
+def test_detect_agent_config_uses_detection_index(tmp_path, monkeypatch) -> None:
+    monkeypatch.setenv("AGENTCFG_CACHE_DIR", str(tmp_path / "cache"))
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    (workspace / "AGENTS.md").write_text("rules", encoding="utf-8")
+
+    result = mcp_server.detect_agent_config(str(workspace))
+
+    assert [candidate["agent_id"] for candidate in result["candidates"]] == ["codex"]
+    assert len(list((tmp_path / "cache" / "detection").glob("*.json"))) == 1
@@ -0,0 +1,63 @@
+import io
+
+import pytest
+
+from src.parser import NodeKind, parse_markdown, parse_markdown_compact
+
+
+SAMPLE = (
+    "# Title\n"
+    "\n"
+    "Intro line\n"
+    "- Item one\n"
+    "  continuation\n"
+    "\n"
+    "1. Ordered\n"
+    "\n"
+    "```python\n"
+    "print('hi')\n"
+    "```\n"
+    "~~~\n"
+    "unclosed\n"
+)
+
+
+def test_parse_markdown_compact_round_trips_to_dataclass_nodes():
+    table = parse_markdown_compact(SAMPLE)
+
+    assert table.to_nodes() == parse_markdown(SAMPLE)
+    assert parse_markdown_compact(io.StringIO(SAMPLE)).to_nodes() == parse_markdown(SAMPLE)
+
+
+def test_compact_nodes_slice_lines_from_shared_buffer():
+    table = parse_markdown_compact(SAMPLE)
+
+    kinds = [node.kind for node in table]
+    assert kinds == [
+        NodeKind.heading,
+        NodeKind.blank_line,
+        NodeKind.paragraph,
+        NodeKind.list_block,
+        NodeKind.blank_line,
+        NodeKind.list_block,
+        NodeKind.blank_line,
+        NodeKind.code_block,
+        NodeKind.code_block,
+    ]
+    assert table[0].level == 1
+    assert table[0].text == "Title"
+    assert table[3].items[0].lines == ["- Item one\n", "  continuation\n"]
+    assert table[5].ordered is True
+    assert table[7].info == "python"
+    assert table[7].lines == ["print('hi')\n"]
+    assert table[8].closing_line is None
+    assert table.buffer.text is SAMPLE
+
+
+def test_compact_nodes_reject_attributes_of_other_kinds():
+    table = parse_markdown_compact(SAMPLE)
+
+    with pytest.raises(AttributeError):
+        table[0].lines
+    with pytest.raises(AttributeError):
+        table[2].level
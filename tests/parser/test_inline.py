@@ -0,0 +1,43 @@
+from src.parser import InlineKind, parse_inline, parse_markdown, parse_markdown_compact
+
+
+def test_parse_inline_finds_code_links_and_emphasis():
+    text = "Run `make test` then see [docs](https://example.com) for **all** *rules*.\n"
+
+    spans = parse_inline(text)
+
+    assert [(span.kind, span.text) for span in spans] == [
+        (InlineKind.code, "make test"),
+        (InlineKind.link, "docs"),
+        (InlineKind.strong, "all"),
+        (InlineKind.emphasis, "rules"),
+    ]
+    assert spans[1].target == "https://example.com"
+    assert text[spans[0].start : spans[0].end] == "`make test`"
+
+
+def test_parse_inline_keeps_code_spans_opaque_and_ignores_intraword_underscores():
+    spans = parse_inline("Use `a *b* c` with snake_case_name and \\*literal\\* stars")
+
+    assert [(span.kind, span.text) for span in spans] == [(InlineKind.code, "a *b* c")]
+
+
+def test_parse_inline_skips_unmatched_delimiters():
+    assert parse_inline("`` unmatched ` * stray [label] (paren") == ()
+
+
+def test_inline_spans_are_memoized_on_nodes():
+    paragraph, list_block = parse_markdown("See `x`.\n\n- item with **bold**\n")[::2]
+
+    assert "inline_spans" not in vars(paragraph)
+    assert paragraph.inline_spans is paragraph.inline_spans
+    assert list_block.items[0].inline_spans[0].kind is InlineKind.strong
+
+
+def test_compact_nodes_memoize_inline_spans():
+    table = parse_markdown_compact("See `x`.\n")
+
+    spans = table[0].inline_spans
+
+    assert spans[0].text == "x"
+    assert table[0].inline_spans is spans
@@ -0,0 +1,31 @@
+from src.parser import NodeKind, parse_markdown, parse_markdown_file
+
+
+def test_parse_markdown_file_matches_text_parser(tmp_path):
+    path = tmp_path / "AGENTS.md"
+    text = "# Règles\n\nUse `uv`.\n- one\n  more\n2) two\n```sh\nmake\n```\n~~~\nopen\n"
+    path.write_bytes(text.encode("utf-8"))
+
+    table = parse_markdown_file(path)
+
+    assert table.to_nodes() == parse_markdown(text)
+    assert table[0].text == "Règles"
+
+
+def test_parse_markdown_file_reports_byte_offsets(tmp_path):
+    path = tmp_path / "CLAUDE.md"
+    path.write_bytes("# Été\nBody\r\n".encode("utf-8"))
+
+    table = parse_markdown_file(path)
+
+    assert [node.kind for node in table] == [NodeKind.heading, NodeKind.paragraph]
+    assert (table[0].offset_start, table[0].offset_end) == (0, 8)
+    assert (table[1].offset_start, table[1].offset_end) == (8, 14)
+    assert table[1].lines == ["Body\n"]
+
+
+def test_parse_markdown_file_handles_empty_files(tmp_path):
+    path = tmp_path / "GEMINI.md"
+    path.write_bytes(b"")
+
+    assert len(parse_markdown_file(path)) == 0
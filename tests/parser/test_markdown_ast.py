@@ -1,10 +1,16 @@
+import io
+
+import pytest
+
 from src.parser.markdown_ast import (
     BlankLineNode,
     CodeBlockNode,
     HeadingNode,
     ListBlockNode,
     ParagraphNode,
+    iter_markdown,
     parse_markdown,
+    reparse,
 )
 
 
@@ -61,3 +67,87 @@ def test_parse_markdown_supports_ordered_lists_from_iterable():
     assert nodes[0].line_end == 3
     assert isinstance(nodes[1], BlankLineNode)
     assert isinstance(nodes[2], ParagraphNode)
+
+
+def test_iter_markdown_consumes_lines_lazily():
+    consumed: list[str] = []
+
+    def source():
+        for line in ["# Title\n", "Body\n", "\n", "- item\n"]:
+            consumed.append(line)
+            yield line
+
+    nodes = iter_markdown(source())
+
+    heading = next(nodes)
+    assert isinstance(heading, HeadingNode)
+    assert consumed == ["# Title\n"]
+
+    paragraph = next(nodes)
+    assert isinstance(paragraph, ParagraphNode)
+    assert paragraph.lines == ["Body\n"]
+    assert consumed == ["# Title\n", "Body\n", "\n"]
+
+    assert [type(node) for node in nodes] == [BlankLineNode, ListBlockNode]
+
+
+def test_iter_markdown_matches_parse_markdown_for_unclosed_fence():
+    text = "Intro\n```\ncode\n# still code\n"
+
+    nodes = list(iter_markdown(io.StringIO(text)))
+
+    assert nodes == parse_markdown(text)
+    assert isinstance(nodes[1], CodeBlockNode)
+    assert nodes[1].closing_line is None
+    assert nodes[1].line_start == 2
+    assert nodes[1].line_end == 5
+
+
+def test_parse_markdown_classifies_block_boundaries():
+    text = "- item\n  continuation\nunindented\n````md\n```\n`````\n3) third\n"
+
+    nodes = parse_markdown(text)
+
+    assert [type(node) for node in nodes] == [
+        ListBlockNode,
+        ParagraphNode,
+        CodeBlockNode,
+        ListBlockNode,
+    ]
+    assert nodes[0].items[0].lines == ["- item\n", "  continuation\n"]
+    assert nodes[2].fence == "````"
+    assert nodes[2].info == "md"
+    assert nodes[2].lines == ["```\n"]
+    assert nodes[2].closing_line == "`````\n"
+    assert nodes[3].ordered is True
+
+
+def test_reparse_reuses_nodes_around_the_edit():
+    before = ["# Title\n", "\n", "First\n", "\n", "## Next\n", "- item\n", "\n", "Tail\n"]
+    after = before[:3] + ["Inserted one\n", "\n", "Inserted two\n"] + before[3:]
+    previous = parse_markdown(before)
+
+    nodes = reparse(previous, after, (4, 7))
+
+    assert nodes == parse_markdown(after)
+    assert nodes[0] is previous[0]
+    assert nodes[1] is previous[1]
+    assert nodes[-1].line_start == previous[-1].line_start + 3
+    assert nodes[-3].items[0].line_start == previous[-3].items[0].line_start + 3
+
+
+def test_reparse_follows_fence_changes_to_the_end():
+    before = "Intro\n\n# Heading\nBody\n"
+    after = "Intro\n```\n# Heading\nBody\n"
+
+    nodes = reparse(parse_markdown(before), after, (2, 3))
+
+    assert nodes == parse_markdown(after)
+    assert isinstance(nodes[-1], CodeBlockNode)
+
+
+def test_reparse_rejects_ranges_outside_the_source():
+    previous = parse_markdown("one\ntwo\n")
+
+    with pytest.raises(ValueError):
+        reparse(previous, "one\n", (1, 4))
@@ -0,0 +1,34 @@
+from src.parser import parse_many, parse_markdown
+
+
+def _write_bundle(root):
+    steering = root / ".kiro" / "steering"
+    steering.mkdir(parents=True)
+    contents = {
+        steering / "tech.md": "# Tech\n- python\n",
+        steering / "product.md": "# Product\nIntro\n",
+        root / "AGENTS.md": "# Agents\n```sh\nmake test\n```\n",
+    }
+    for path, text in contents.items():
+        path.write_text(text, encoding="utf-8")
+    return contents
+
+
+def test_parse_many_returns_sorted_results_in_process(tmp_path):
+    contents = _write_bundle(tmp_path)
+
+    results = parse_many(reversed(list(contents)), workers=4)
+
+    assert list(results) == sorted(str(path) for path in contents)
+    for path, text in contents.items():
+        assert results[str(path)] == parse_markdown(text)
+
+
+def test_parse_many_uses_process_pool_for_multiple_batches(tmp_path):
+    contents = _write_bundle(tmp_path)
+
+    results = parse_many(contents, workers=2, batch_bytes=1, min_parallel_bytes=0)
+
+    assert list(results) == sorted(str(path) for path in contents)
+    for path, text in contents.items():
+        assert results[str(path)] == parse_markdown(text)
@@ -0,0 +1,69 @@
+import os
+
+from src.parser import ParseCache, parse_markdown
+from src.parser import cache as cache_module
+
+
+SAMPLE = "# Title\n\nIntro\n1. First\n   more\n```sh\nmake test\n```\n~~~\n"
+
+
+def test_parse_cache_round_trips_nodes_and_skips_parsing_on_hit(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+
+    first = cache.parse(SAMPLE)
+
+    def fail_parse(source):
+        raise AssertionError("parse_markdown should not run on a cache hit")
+
+    monkeypatch.setattr(cache_module, "parse_markdown", fail_parse)
+    second = ParseCache(tmp_path).parse(SAMPLE.splitlines(keepends=True))
+
+    assert first == parse_markdown(SAMPLE)
+    assert second == first
+    assert cache.misses == 1
+
+
+def test_parse_cache_keys_include_parser_version(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+    key = cache.key_for(SAMPLE)
+
+    monkeypatch.setattr(cache_module, "PARSER_VERSION", "next")
+
+    assert cache.key_for(SAMPLE) != key
+
+
+def test_parse_cache_evicts_least_recently_used_entries(tmp_path):
+    cache = ParseCache(tmp_path)
+    cache.parse("# One\n")
+    entry_size = sum(path.stat().st_size for path in tmp_path.iterdir())
+    cache = ParseCache(tmp_path, max_bytes=entry_size * 2 + 16)
+    old_key = cache.key_for("# One\n")
+    os.utime(tmp_path / f"{old_key}.nodes", (0, 0))
+
+    cache.parse("# Two\n")
+    cache.parse("# Three\n")
+
+    remaining = {path.name for path in tmp_path.iterdir()}
+    assert f"{old_key}.nodes" not in remaining
+    assert len(remaining) == 2
+
+
+def test_parse_cache_discards_corrupt_entries(tmp_path):
+    cache = ParseCache(tmp_path)
+    key = cache.key_for(SAMPLE)
+    (tmp_path / f"{key}.nodes").write_bytes(b"not a cache entry")
+
+    assert cache.get(key) is None
+    assert not (tmp_path / f"{key}.nodes").exists()
+
+
+def test_parse_cache_removes_temporary_file_when_write_fails(tmp_path, monkeypatch):
+    cache = ParseCache(tmp_path)
+
+    def fail_replace(source, target):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+    cache.parse(SAMPLE)
+
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,87 @@
+import os
+import time
+
+import pytest
+
+from src.parser import parse_markdown
+from src.parser.inline import parse_inline
+
+# Conservative floor for CI runners; local runs are typically an order of magnitude faster.
+MIN_LINES_PER_SECOND = int(os.getenv("AGENTCFG_PARSER_MIN_LINES_PER_SEC", "20000"))
+# Doubling twice should cost ~4x; a quadratic path would cost ~16x.
+MAX_SCALING_RATIO = 8.0
+
+LINE_CORPORA = {
+    "unclosed_fence": lambda n: ["```\n"] + ["# not a heading\n"] * (n - 1),
+    "one_line_list_items": lambda n: ["- item\n"] * n,
+    "ordered_list_items": lambda n: [f"{index}. item\n" for index in range(n)],
+    "list_continuations": lambda n: ["- item\n"] + ["  continuation\n"] * (n - 1),
+    "paragraph_lines": lambda n: ["plain text line\n"] * n,
+    "blank_lines": lambda n: ["\n"] * n,
+    "alternating_blocks": lambda n: ["# h\n", "text\n", "- item\n", "\n"] * (n // 4),
+}
+
+LONG_LINE_CORPORA = {
+    "leading_whitespace": lambda width: " " * width + "text\n",
+    "digit_run": lambda width: "1" * width + "x\n",
+    "marker_then_spaces": lambda width: "-" + " " * width + "x\n",
+    "heading_run": lambda width: "#" * width + "\n",
+    "backtick_run": lambda width: "`" * width + "\n",
+}
+
+INLINE_CORPORA = {
+    "unmatched_link_labels": lambda size: "[" + "[x" * (size // 2) + "]",
+    "backtick_runs_of_each_length": lambda size: "".join(
+        "`" * length + "a" for length in range(1, int((2 * size) ** 0.5))
+    ),
+    "unclosed_emphasis": lambda size: "*a " * (size // 3),
+    "links": lambda size: "[a](b) " * (size // 7),
+}
+
+
+def _best_time(lines, repeats=3, parse=parse_markdown):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter()
+        parse(lines)
+        best = min(best, time.perf_counter() - started)
+    return max(best, 1e-6)
+
+
+@pytest.mark.parametrize("name", sorted(LINE_CORPORA))
+def test_parse_markdown_scales_linearly_with_line_count(name):
+    build = LINE_CORPORA[name]
+
+    small = _best_time(build(4000))
+    large = _best_time(build(16000))
+
+    assert large / small < MAX_SCALING_RATIO
+
+
+@pytest.mark.parametrize("name", sorted(LONG_LINE_CORPORA))
+def test_parse_markdown_scales_linearly_with_line_length(name):
+    build = LONG_LINE_CORPORA[name]
+
+    small = _best_time([build(5000)] * 200)
+    large = _best_time([build(20000)] * 200)
+
+    assert large / small < MAX_SCALING_RATIO
+
+
+@pytest.mark.parametrize("name", sorted(LINE_CORPORA))
+def test_parse_markdown_meets_throughput_floor(name):
+    lines = LINE_CORPORA[name](20000)
+
+    lines_per_second = len(lines) / _best_time(lines)
+
+    assert lines_per_second >= MIN_LINES_PER_SECOND
+
+
+@pytest.mark.parametrize("name", sorted(INLINE_CORPORA))
+def test_parse_inline_scales_linearly_with_text_length(name):
+    build = INLINE_CORPORA[name]
+
+    small = _best_time(build(100000), parse=parse_inline)
+    large = _best_time(build(400000), parse=parse_inline)
+
+    assert large / small < MAX_SCALING_RATIO
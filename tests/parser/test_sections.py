@@ -0,0 +1,57 @@
+from src.parser import HeadingNode, ParagraphNode, SectionIndex, parse_markdown
+
+
+SAMPLE = (
+    "Preamble\n"
+    "# A\n"
+    "Intro A\n"
+    "## B\n"
+    "Body B\n"
+    "### C\n"
+    "Body C\n"
+    "## D\n"
+    "Body D\n"
+    "# A\n"
+    "## B\n"
+    "Second B\n"
+)
+
+
+def test_section_index_builds_heading_tree():
+    index = SectionIndex(parse_markdown(SAMPLE))
+
+    assert [section.path for section in index.sections] == [
+        ("A",),
+        ("A", "B"),
+        ("A", "B", "C"),
+        ("A", "D"),
+        ("A",),
+        ("A", "B"),
+    ]
+    assert [child.title for child in index.root.children] == ["A", "A"]
+    assert [child.title for child in index.root.children[0].children] == ["B", "D"]
+    assert index.sections[1].line_start == 4
+    assert index.sections[1].line_end == 8
+    assert index.root.line_end == 13
+
+
+def test_section_index_locates_lines():
+    index = SectionIndex(parse_markdown(SAMPLE))
+
+    assert index.section_at_line(1) is index.root
+    assert index.section_at_line(5).path == ("A", "B")
+    assert index.section_at_line(7).path == ("A", "B", "C")
+    assert index.section_at_line(9).path == ("A", "D")
+    assert isinstance(index.node_at_line(6), HeadingNode)
+    assert index.node_at_line(99) is None
+
+
+def test_section_index_returns_nodes_under_path():
+    index = SectionIndex(parse_markdown(SAMPLE))
+
+    nodes = index.nodes_under(["A", "B"])
+
+    paragraphs = [node.lines for node in nodes if isinstance(node, ParagraphNode)]
+    assert paragraphs == [["Body B\n"], ["Body C\n"], ["Second B\n"]]
+    assert len(index.sections_for_path(("A",))) == 2
+    assert index.nodes_under(["missing"]) == []
@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import math
+import os
 from pathlib import Path
 
-from src.registry import detect_agent_configs
+from src.registry import AgentRegistry, default_registry, detect_agent_configs
 
 
 def _touch(path: Path) -> None:
@@ -62,3 +63,32 @@ def test_detect_agent_configs_orders_candidates_by_confidence(tmp_path) -> None:
     assert math.isclose(confidence["claude"], 1.0)
     assert math.isclose(confidence["codex"], 0.5)
     assert math.isclose(confidence["kiro"], 1 / 3)
+
+
+def test_detect_agent_configs_only_lists_directories_that_can_match(tmp_path, monkeypatch) -> None:
+    _touch(tmp_path / "CLAUDE.md")
+    _touch(tmp_path / "src" / "deep" / "CLAUDE.md")
+    _touch(tmp_path / ".kiro" / "steering" / "nested" / "rules.md")
+    _touch(tmp_path / ".kiro" / "specs" / "spec.md")
+    registry = AgentRegistry(
+        agents=tuple(
+            agent for agent in default_registry().agents if agent.agent_id in ("claude", "kiro")
+        )
+    )
+    listed: list[str] = []
+    real_scandir = os.scandir
+
+    def scandir(path):
+        listed.append(Path(path).relative_to(tmp_path).as_posix())
+        return real_scandir(path)
+
+    monkeypatch.setattr(os, "scandir", scandir)
+
+    detections = detect_agent_configs(tmp_path, registry=registry)
+
+    assert sorted(listed) == [".", ".kiro", ".kiro/steering", ".kiro/steering/nested"]
+    found = [
+        (detection.agent_id, [match.path for match in detection.matches])
+        for detection in detections
+    ]
+    assert found == [("claude", ["CLAUDE.md"]), ("kiro", [".kiro/steering/nested/rules.md"])]
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from src.registry import DetectionIndex, detect_agent_configs
+from src.registry.models import AgentArtifact, AgentDefinition, AgentRegistry, ArtifactKind
+
+OLD_MTIME = 1_000_000_000
+
+
+def _touch(path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("content", encoding="utf-8")
+
+
+def _age_directories(root: Path, offset: int = 0) -> None:
+    # Directory mtimes inside the racy window are never trusted, so backdate them.
+    for current, _, _ in os.walk(root):
+        os.utime(current, (OLD_MTIME + offset, OLD_MTIME + offset))
+
+
+def _workspace(tmp_path: Path) -> Path:
+    root = tmp_path / "workspace"
+    _touch(root / "AGENTS.md")
+    _touch(root / "CLAUDE.md")
+    for index in range(5):
+        _touch(root / f"pkg{index}" / "src" / "main.py")
+    _touch(root / "pkg1" / "AGENTS.md")
+    _touch(root / ".kiro" / "steering" / "rules.md")
+    _age_directories(root)
+    return root
+
+
+def test_detection_index_reuses_unchanged_directories(tmp_path) -> None:
+    root = _workspace(tmp_path)
+    index = DetectionIndex(tmp_path / "cache")
+
+    first = index.detect(root)
+    listed = index.relisted
+    second = index.detect(root)
+
+    assert first == second == detect_agent_configs(root)
+    assert listed == index.relisted
+    assert index.reused == listed
+    assert len(list((tmp_path / "cache").iterdir())) == 1
+
+
+def test_detection_index_relists_only_changed_directories(tmp_path) -> None:
+    root = _workspace(tmp_path)
+    index = DetectionIndex(tmp_path / "cache")
+    index.detect(root)
+    relisted = index.relisted
+
+    _touch(root / "pkg3" / "src" / "AGENTS.md")
+    os.utime(root / "pkg3" / "src", (OLD_MTIME + 5, OLD_MTIME + 5))
+    (root / "pkg1" / "AGENTS.md").unlink()
+    os.utime(root / "pkg1", (OLD_MTIME + 5, OLD_MTIME + 5))
+    detections = index.detect(root)
+
+    assert index.relisted - relisted == 2
+    assert detections == detect_agent_configs(root)
+    codex = next(detection for detection in detections if detection.agent_id == "codex")
+    assert [match.path for match in codex.matches] == ["AGENTS.md", "pkg3/src/AGENTS.md"]
+
+
+def test_detection_index_rebuilds_for_new_registry_or_corrupt_file(tmp_path, caplog) -> None:
+    root = _workspace(tmp_path)
+    index = DetectionIndex(tmp_path / "cache")
+    index.detect(root)
+    full = index.relisted
+    registry = AgentRegistry(
+        agents=(
+            AgentDefinition(
+                agent_id="custom",
+                display_name="Custom",
+                artifacts=(AgentArtifact(pattern="main.py", kind=ArtifactKind.file),),
+            ),
+        )
+    )
+
+    detections = index.detect(root, registry=registry)
+    index.path_for(root).write_text("{not json", encoding="utf-8")
+    index.detect(root)
+
+    assert [len(detection.matches) for detection in detections] == [5]
+    assert index.relisted == full * 3
+    assert "Discarding unreadable detection index" in caplog.text
+
+
+def test_detection_index_leaves_no_temporary_file_when_save_fails(tmp_path, monkeypatch) -> None:
+    root = _workspace(tmp_path)
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+
+    def fail_replace(source, target):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+
+    assert DetectionIndex(cache_dir).detect(root) == detect_agent_configs(root)
+    assert list(cache_dir.iterdir()) == []
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from src.registry.matcher import ArtifactMatcher, compile_registry
+from src.registry.models import (
+    AgentArtifact,
+    AgentDefinition,
+    AgentRegistry,
+    ArtifactKind,
+    default_registry,
+)
+
+
+def _registry() -> AgentRegistry:
+    return AgentRegistry(
+        agents=(
+            AgentDefinition(
+                agent_id="docs",
+                display_name="Docs",
+                artifacts=(
+                    AgentArtifact(pattern="*.md", kind=ArtifactKind.glob),
+                    AgentArtifact(pattern="docs", kind=ArtifactKind.directory),
+                ),
+            ),
+            AgentDefinition(
+                agent_id="rules",
+                display_name="Rules",
+                artifacts=(
+                    AgentArtifact(pattern="RULES.md", kind=ArtifactKind.file, root_only=True),
+                    AgentArtifact(pattern="rules/*.md", kind=ArtifactKind.glob),
+                    AgentArtifact(pattern="*/rules", kind=ArtifactKind.directory),
+                ),
+            ),
+        )
+    )
+
+
+def _matched(entries) -> list[tuple[str, str]]:
+    return [(entry.agent_id, entry.artifact.pattern) for entry in entries]
+
+
+def test_matcher_reports_every_overlapping_artifact_in_registry_order() -> None:
+    matcher = ArtifactMatcher(_registry())
+
+    assert _matched(matcher.match_file("rules/a.md", "a.md")) == [
+        ("docs", "*.md"),
+        ("rules", "rules/*.md"),
+    ]
+    assert _matched(matcher.match_file("RULES.md", "RULES.md")) == [
+        ("docs", "*.md"),
+        ("rules", "RULES.md"),
+    ]
+    assert _matched(matcher.match_file("nested/RULES.md", "RULES.md")) == [("docs", "*.md")]
+    assert matcher.match_file("src/main.py", "main.py") == []
+
+
+def test_matcher_matches_literal_and_glob_directories() -> None:
+    matcher = ArtifactMatcher(_registry())
+
+    assert _matched(matcher.match_directory("docs")) == [("docs", "docs")]
+    assert _matched(matcher.match_directory("app/rules")) == [("rules", "*/rules")]
+    assert matcher.match_directory(".") == []
+
+
+def test_compile_registry_reuses_matcher_for_equal_registries() -> None:
+    assert compile_registry(default_registry()) is compile_registry(default_registry())
+
+
+def test_walk_plan_limits_descent_to_possible_matches() -> None:
+    registry = AgentRegistry(
+        agents=tuple(
+            agent for agent in default_registry().agents if agent.agent_id in ("claude", "kiro")
+        )
+    )
+    root = ArtifactMatcher(registry).walk_root
+
+    steering = root.child(".kiro").child("steering")
+
+    assert root.child("src") is None
+    assert root.child(".kiro").child("specs") is None
+    assert steering.subtree
+    assert steering.child("nested") is steering
+
+
+def test_walk_plan_for_root_only_artifacts_has_no_children() -> None:
+    registry = AgentRegistry(
+        agents=tuple(agent for agent in default_registry().agents if agent.agent_id == "claude")
+    )
+    root = ArtifactMatcher(registry).walk_root
+
+    assert root.children == {}
+    assert not root.subtree
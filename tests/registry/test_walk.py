@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from src.registry import detect_agent_configs
+from src.registry import walk as walk_module
+from src.registry.matcher import WalkNode
+from src.registry.walk import walk_workspace
+
+
+def _build_tree(root: Path) -> None:
+    for index in range(30):
+        directory = root / f"pkg{index}" / "src" / ("nested" if index % 2 else "flat")
+        directory.mkdir(parents=True)
+        (directory / "AGENTS.md").write_text("rules", encoding="utf-8")
+        (directory / "main.py").write_text("", encoding="utf-8")
+    (root / "node_modules" / "dep").mkdir(parents=True)
+    (root / "node_modules" / "dep" / "AGENTS.md").write_text("ignored", encoding="utf-8")
+    (root / "CLAUDE.md").write_text("root", encoding="utf-8")
+
+
+def _everything() -> WalkNode:
+    plan = WalkNode()
+    plan.add([], subtree=True)
+    return plan
+
+
+def test_walk_workspace_matches_serial_walk(tmp_path) -> None:
+    _build_tree(tmp_path)
+    os.symlink(tmp_path / "pkg0", tmp_path / "linked")
+
+    serial = sorted(walk_workspace(tmp_path, _everything(), {"node_modules"}, workers=1))
+    parallel = sorted(walk_workspace(tmp_path, _everything(), {"node_modules"}, workers=4))
+
+    assert parallel == serial
+    rel_dirs = [rel_dir for rel_dir, _ in serial]
+    assert "." in rel_dirs and "pkg3/src/nested" in rel_dirs
+    assert not any(rel_dir.startswith(("node_modules", "linked")) for rel_dir in rel_dirs)
+    assert "linked" not in dict(serial)["."]
+
+
+def test_walk_workspace_bounds_queued_listings(tmp_path, monkeypatch) -> None:
+    _build_tree(tmp_path)
+    monkeypatch.setattr(walk_module, "PENDING_LISTINGS_PER_WORKER", 1)
+    active = 0
+    peak = 0
+    real_scan = walk_module._scan_directory
+
+    def scan(path):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        try:
+            return real_scan(path)
+        finally:
+            active -= 1
+
+    monkeypatch.setattr(walk_module, "_scan_directory", scan)
+
+    listed = list(walk_workspace(tmp_path, _everything(), (), workers=2))
+
+    assert len(listed) == 1 + 30 * 3 + 2
+    assert peak <= 2
+
+
+def test_detect_agent_configs_parallel_matches_serial(tmp_path) -> None:
+    _build_tree(tmp_path)
+
+    serial = detect_agent_configs(tmp_path, workers=1)
+    parallel = detect_agent_configs(tmp_path, workers=8)
+
+    assert parallel == serial
+    assert len(next(d for d in serial if d.agent_id == "codex").matches) == 30
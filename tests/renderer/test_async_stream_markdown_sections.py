@@ -0,0 +1,92 @@
+import asyncio
+
+from src.renderer.streaming import async_stream_markdown_files, async_stream_markdown_sections
+
+
+SOURCE_TEXT = (
+    "Intro line\n"
+    "\n"
+    "## First section\n"
+    "Line A\n"
+    "```python\n"
+    "## Not a heading\n"
+    "```\n"
+    "## Second section\n"
+    "Line B ✓\n"
+)
+
+
+class RecordingWriter:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+        self.drain_count = 0
+
+    def write(self, data: bytes) -> None:
+        self.chunks.append(data)
+
+    async def drain(self) -> None:
+        self.drain_count += 1
+
+    def getvalue(self) -> bytes:
+        return b"".join(self.chunks)
+
+
+async def _lines(text: str):
+    for line in text.splitlines(keepends=True):
+        yield line
+
+
+def test_async_stream_markdown_sections_drains_per_section():
+    writer = RecordingWriter()
+
+    asyncio.run(async_stream_markdown_sections(SOURCE_TEXT.splitlines(keepends=True), writer))
+
+    assert writer.getvalue() == SOURCE_TEXT.encode("utf-8")
+    assert len(writer.chunks) == 3
+    assert writer.drain_count == 3
+
+
+def test_async_stream_markdown_sections_accepts_async_source():
+    writer = RecordingWriter()
+
+    asyncio.run(async_stream_markdown_sections(_lines(SOURCE_TEXT), writer))
+
+    assert writer.getvalue() == SOURCE_TEXT.encode("utf-8")
+
+
+def test_async_stream_markdown_files_wraps_each_file_in_markers():
+    writer = RecordingWriter()
+    files = [("a.md", ["# A\n", "alpha\n"]), ("b.md", _lines("# B\nbeta\n"))]
+
+    asyncio.run(async_stream_markdown_files(files, writer))
+
+    expected = (
+        "BEGIN FILE a.md\n# A\nalpha\nEND FILE a.md\nBEGIN FILE b.md\n# B\nbeta\nEND FILE b.md\n"
+    )
+    assert writer.getvalue().decode("utf-8") == expected
+
+
+def test_async_stream_markdown_sections_waits_for_slow_reader():
+    class SlowWriter(RecordingWriter):
+        def __init__(self) -> None:
+            super().__init__()
+            self.release = asyncio.Event()
+
+        async def drain(self) -> None:
+            await self.release.wait()
+            self.release.clear()
+
+    async def scenario() -> list[int]:
+        writer = SlowWriter()
+        source = [f"## Section {index}\nbody\n" for index in range(5)]
+        render = asyncio.create_task(async_stream_markdown_sections(source, writer))
+        written: list[int] = []
+        for _ in range(5):
+            await asyncio.sleep(0)
+            written.append(len(writer.chunks))
+            writer.release.set()
+            await asyncio.sleep(0)
+        await render
+        return written
+
+    assert asyncio.run(scenario()) == [1, 2, 3, 4, 5]
@@ -0,0 +1,101 @@
+import os
+import stat
+
+import pytest
+
+from src.renderer.output import AtomicOutputFile, OutputStatus
+
+
+def test_atomic_output_writes_new_file_with_default_mode(tmp_path):
+    path = tmp_path / "AGENTS.md"
+    umask = os.umask(0o022)
+    try:
+        with AtomicOutputFile(path) as output:
+            output.write(b"hello\n")
+    finally:
+        os.umask(umask)
+
+    assert output.status is OutputStatus.written
+    assert path.read_bytes() == b"hello\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o644
+
+
+def test_atomic_output_leaves_identical_file_untouched(tmp_path):
+    path = tmp_path / "AGENTS.md"
+    path.write_bytes(b"same\n")
+    inode = path.stat().st_ino
+
+    output = AtomicOutputFile(path)
+    output.write(b"sa")
+    output.write(b"me\n")
+
+    assert output.commit() is OutputStatus.unchanged
+    assert path.stat().st_ino == inode
+    assert os.listdir(tmp_path) == ["AGENTS.md"]
+
+
+def test_atomic_output_replaces_changed_file_and_keeps_mode(tmp_path):
+    path = tmp_path / "AGENTS.md"
+    path.write_bytes(b"before\n")
+    path.chmod(0o600)
+
+    output = AtomicOutputFile(path)
+    output.write(b"after!\n")
+
+    assert output.commit() is OutputStatus.written
+    assert path.read_bytes() == b"after!\n"
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+
+def test_atomic_output_discards_on_error(tmp_path):
+    path = tmp_path / "AGENTS.md"
+    path.write_bytes(b"original\n")
+
+    with pytest.raises(RuntimeError):
+        with AtomicOutputFile(path) as output:
+            output.write(b"partial")
+            raise RuntimeError("render failed")
+
+    assert path.read_bytes() == b"original\n"
+    assert os.listdir(tmp_path) == ["AGENTS.md"]
+
+
+def test_atomic_output_writes_through_symlink(tmp_path):
+    real = tmp_path / "real.md"
+    real.write_bytes(b"old\n")
+    link = tmp_path / "link.md"
+    link.symlink_to(real)
+
+    with AtomicOutputFile(link) as output:
+        output.write(b"new\n")
+
+    assert output.status is OutputStatus.written
+    assert link.is_symlink()
+    assert real.read_bytes() == b"new\n"
+
+
+def test_atomic_output_discards_temporary_file_when_replace_fails(tmp_path, monkeypatch):
+    path = tmp_path / "AGENTS.md"
+
+    def fail_replace(source, target):
+        raise OSError(18, "Invalid cross-device link")
+
+    monkeypatch.setattr(os, "replace", fail_replace)
+
+    with pytest.raises(OSError):
+        with AtomicOutputFile(path) as output:
+            output.write(b"hello\n")
+
+    assert os.listdir(tmp_path) == []
+
+
+def test_atomic_output_does_not_change_the_process_umask(tmp_path, monkeypatch):
+    def fail_umask(mask):
+        raise AssertionError("umask changed")
+
+    monkeypatch.setattr(os, "umask", fail_umask)
+
+    with AtomicOutputFile(tmp_path / "AGENTS.md") as output:
+        output.write(b"hello\n")
+
+    assert output.status is OutputStatus.written
@@ -1,11 +1,16 @@
 import io
+import os
 
 import pytest
 
+from src.renderer import streaming
 from src.renderer.streaming import (
     ChunkedStdoutWriter,
+    VectoredWriter,
+    chunk_size_for,
     emit_file_footer,
     emit_file_header,
+    iter_byte_chunks,
     iter_chunks,
 )
 
@@ -44,3 +49,175 @@ def test_emit_file_header_and_footer():
     emit_file_footer(buffer, "AGENTS.md")
 
     assert buffer.getvalue() == "BEGIN FILE AGENTS.md\nEND FILE AGENTS.md\n"
+
+
+def test_iter_byte_chunks_yields_memoryview_slices():
+    chunks = list(iter_byte_chunks(b"abcdef", 4))
+
+    assert all(isinstance(chunk, memoryview) for chunk in chunks)
+    assert [bytes(chunk) for chunk in chunks] == [b"abcd", b"ef"]
+
+
+def test_chunked_stdout_writer_writes_encoded_slices_to_binary_buffer():
+    class RecordingBytes(io.BytesIO):
+        def __init__(self) -> None:
+            super().__init__()
+            self.writes: list[bytes] = []
+
+        def write(self, data) -> int:
+            self.writes.append(bytes(data))
+            return super().write(data)
+
+    raw = RecordingBytes()
+    target = io.TextIOWrapper(raw, encoding="utf-8", write_through=False)
+    target.write("head\n")
+    writer = ChunkedStdoutWriter(target, chunk_size=4, bypass_text_layer=True)
+
+    writer.write("héllo\n")
+    target.flush()
+
+    assert writer.binary is True
+    assert raw.getvalue() == "head\nhéllo\n".encode("utf-8")
+    assert raw.writes[-2:] == [b"h\xc3\xa9l", b"lo\n"]
+
+
+def test_chunked_stdout_writer_does_not_flush_the_buffer_per_write(tmp_path):
+    class RecordingFileIO(io.FileIO):
+        raw_writes = 0
+
+        def write(self, data) -> int:
+            RecordingFileIO.raw_writes += 1
+            return super().write(data)
+
+    path = tmp_path / "out.md"
+    raw = RecordingFileIO(path, "w")
+    target = io.TextIOWrapper(io.BufferedWriter(raw, buffer_size=64 * 1024), encoding="utf-8")
+    writer = ChunkedStdoutWriter(target, chunk_size=64 * 1024, bypass_text_layer=True)
+
+    for index in range(1000):
+        writer.write(f"line {index}\n")
+    target.close()
+
+    assert path.read_text(encoding="utf-8") == "".join(f"line {index}\n" for index in range(1000))
+    assert RecordingFileIO.raw_writes <= 2
+
+
+def test_chunked_stdout_writer_uses_text_path_without_binary_buffer():
+    writer = ChunkedStdoutWriter(io.StringIO(), bypass_text_layer=True)
+
+    assert writer.binary is False
+
+
+@pytest.mark.parametrize("encoding", ["utf-16", "utf-8-sig"])
+def test_chunked_stdout_writer_keeps_bom_encodings_on_text_path(encoding):
+    raw = io.BytesIO()
+    target = io.TextIOWrapper(raw, encoding=encoding)
+    writer = ChunkedStdoutWriter(target, chunk_size=4, bypass_text_layer=True)
+
+    writer.write("ab")
+    writer.write("cd")
+    target.flush()
+
+    assert writer.binary is False
+    assert raw.getvalue().decode(encoding) == "abcd"
+
+
+def test_chunked_stdout_writer_keeps_newline_translation_by_default():
+    raw = io.BytesIO()
+    target = io.TextIOWrapper(raw, encoding="utf-8", newline="\r\n")
+    writer = ChunkedStdoutWriter(target, chunk_size=4)
+
+    writer.write("a\nb\n")
+    target.flush()
+
+    assert writer.binary is False
+    assert raw.getvalue() == b"a\r\nb\r\n"
+
+
+def _record_writev(monkeypatch, *, max_bytes=None):
+    calls = []
+    real_writev = os.writev
+
+    def writev(fd, buffers):
+        buffers = [bytes(buffer) for buffer in buffers]
+        calls.append(buffers)
+        if max_bytes is not None:
+            return os.write(fd, b"".join(buffers)[:max_bytes])
+        return real_writev(fd, buffers)
+
+    monkeypatch.setattr(os, "writev", writev)
+    return calls
+
+
+def test_vectored_writer_resumes_after_partial_writes(tmp_path, monkeypatch):
+    calls = _record_writev(monkeypatch, max_bytes=5)
+    path = tmp_path / "out.md"
+    fragments = [b"- item %d\n" % index for index in range(20)]
+
+    with open(path, "wb") as handle:
+        writer = VectoredWriter(handle.fileno(), max_pending_bytes=1024)
+        for fragment in fragments:
+            writer.write(fragment)
+        writer.flush()
+
+    assert path.read_bytes() == b"".join(fragments)
+    assert len(calls) == -(-len(b"".join(fragments)) // 5)
+
+
+def test_vectored_writer_caps_buffers_per_call(tmp_path, monkeypatch):
+    calls = _record_writev(monkeypatch)
+    monkeypatch.setattr(streaming, "IOV_MAX", 4)
+    path = tmp_path / "out.md"
+
+    with open(path, "wb") as handle:
+        writer = VectoredWriter(handle.fileno(), max_pending_bytes=1024)
+        for index in range(10):
+            writer.write(b"%d\n" % index)
+        writer.flush()
+
+    assert path.read_bytes() == b"".join(b"%d\n" % index for index in range(10))
+    assert [len(buffers) for buffers in calls] == [4, 4, 2]
+
+
+def test_chunked_stdout_writer_batches_lines_with_writev(tmp_path, monkeypatch):
+    calls = _record_writev(monkeypatch)
+    path = tmp_path / "out.md"
+    lines = [f"- item {index} ✓\n" for index in range(100)]
+
+    with open(path, "w", encoding="utf-8") as target:
+        target.write("# List\n")
+        ChunkedStdoutWriter(target, chunk_size=4096, bypass_text_layer=True).write_lines(lines)
+        target.write("done\n")
+
+    assert path.read_text(encoding="utf-8") == "# List\n" + "".join(lines) + "done\n"
+    assert len(calls) == 1
+    assert len(calls[0]) == 100
+
+
+def test_chunk_size_for_picks_size_by_target_kind(tmp_path):
+    with open(tmp_path / "out.md", "w", encoding="utf-8") as regular:
+        assert chunk_size_for(regular) >= streaming.FILE_CHUNK_SIZE
+
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb"), os.fdopen(write_fd, "wb") as pipe:
+        assert chunk_size_for(pipe) >= 4096
+
+    primary_fd, secondary_fd = os.openpty()
+    with os.fdopen(primary_fd, "wb"), os.fdopen(secondary_fd, "wb") as tty:
+        assert chunk_size_for(tty) == streaming.TTY_CHUNK_SIZE
+
+    assert chunk_size_for(io.StringIO()) == streaming.DEFAULT_CHUNK_SIZE
+
+
+def test_chunked_stdout_writer_defaults_to_target_chunk_size(tmp_path):
+    with open(tmp_path / "out.md", "w", encoding="utf-8") as regular:
+        assert ChunkedStdoutWriter(regular).chunk_size == chunk_size_for(regular)
+        assert ChunkedStdoutWriter(regular, chunk_size=512).chunk_size == 512
+
+
+def test_chunk_size_for_pipe_falls_back_without_getpipe_sz(monkeypatch):
+    monkeypatch.setattr(streaming, "_F_GETPIPE_SZ", None)
+
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb"), os.fdopen(write_fd, "wb") as pipe:
+        assert chunk_size_for(pipe) == streaming.PIPE_CHUNK_SIZE
@@ -0,0 +1,79 @@
+import hashlib
+import io
+
+import pytest
+
+from src.renderer.framing import (
+    iter_frame_headers,
+    iter_frames,
+    read_frame,
+    write_frame,
+    write_framed_files,
+)
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data: bytes) -> None:
+        self._source = io.BytesIO(data)
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        chunk = self._source.read(min(len(buffer), 7))
+        buffer[: len(chunk)] = chunk
+        return len(chunk)
+
+
+def _framed() -> bytes:
+    target = io.BytesIO()
+    write_framed_files(
+        [
+            ("AGENTS.md", ["# Rules\n", "BEGIN FILE fake\n"]),
+            (".kiro/steering/style.md", ["tabs ✓\n"]),
+            ("empty.md", []),
+        ],
+        target,
+    )
+    return target.getvalue()
+
+
+def test_frame_headers_skip_payloads_and_record_offsets():
+    data = _framed()
+    source = io.BytesIO(data)
+
+    headers = list(iter_frame_headers(source))
+
+    assert [(header.name, header.length) for header in headers] == [
+        ("AGENTS.md", 24),
+        (".kiro/steering/style.md", 9),
+        ("empty.md", 0),
+    ]
+    assert data[headers[1].offset : headers[1].end] == "tabs ✓\n".encode("utf-8")
+    assert headers[0].digest == hashlib.sha256(b"# Rules\nBEGIN FILE fake\n").digest()
+    assert read_frame(source, headers[1]) == "tabs ✓\n".encode("utf-8")
+
+
+def test_frames_read_from_non_seekable_stream():
+    data = _framed()
+
+    headers = list(iter_frame_headers(io.BufferedReader(NonSeekable(data))))
+    frames = list(iter_frames(NonSeekable(data)))
+
+    names = [header.name for header in headers]
+    assert names == ["AGENTS.md", ".kiro/steering/style.md", "empty.md"]
+    assert [header.offset for header in headers] == [header.offset for header, _ in frames]
+    assert frames[0][1] == b"# Rules\nBEGIN FILE fake\n"
+
+
+def test_frames_detect_corruption_and_truncation():
+    target = io.BytesIO()
+    write_frame(target, "AGENTS.md", b"payload")
+    data = target.getvalue()
+
+    with pytest.raises(ValueError, match="digest mismatch"):
+        list(iter_frames(io.BytesIO(data[:-1] + b"X")))
+    with pytest.raises(ValueError, match="truncated"):
+        list(iter_frames(io.BytesIO(data[:-1])))
+    with pytest.raises(ValueError, match="bad frame magic"):
+        list(iter_frame_headers(io.BytesIO(b"X" + data[1:])))
@@ -0,0 +1,105 @@
+import io
+
+import pytest
+
+from src.renderer import cache as cache_module
+from src.renderer.cache import RenderCache
+from src.renderer.streaming import stream_markdown_sections
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    def render(section: str, target_agent: str) -> str:
+        calls.append((section, target_agent))
+        return f"[{target_agent}] {section}"
+
+    monkeypatch.setattr(cache_module, "render_section", render)
+    return calls
+
+
+def test_render_cache_reuses_results_per_section_and_agent(calls):
+    cache = RenderCache()
+
+    first = cache.render("## Rules\nbody\n", "codex")
+    second = cache.render("## Rules\nbody\n", "codex")
+    other_agent = cache.render("## Rules\nbody\n", "gemini")
+
+    assert first == second == "[codex] ## Rules\nbody\n"
+    assert other_agent == "[gemini] ## Rules\nbody\n"
+    assert len(calls) == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_render_cache_evicts_least_recently_used(calls):
+    cache = RenderCache(max_chars=2 * len("[codex] a"))
+
+    cache.render("a", "codex")
+    cache.render("b", "codex")
+    cache.render("a", "codex")
+    cache.render("c", "codex")
+    cache.render("a", "codex")
+    cache.render("b", "codex")
+
+    assert [section for section, _ in calls] == ["a", "b", "c", "b"]
+
+
+def test_render_cache_disk_tier_survives_new_instances(tmp_path, calls):
+    RenderCache(directory=tmp_path).render("line\r\n", "codex")
+    cache = RenderCache(directory=tmp_path)
+
+    assert cache.render("line\r\n", "codex") == "[codex] line\r\n"
+    assert len(calls) == 1
+    assert cache.hits == 1
+
+
+def test_render_cache_discards_unreadable_disk_entries(tmp_path, calls):
+    cache = RenderCache(directory=tmp_path)
+    key = cache.key_for("body", "codex")
+    entry = tmp_path / f"{key}.section"
+    entry.write_bytes(b"\xff\xfe")
+
+    assert cache.render("body", "codex") == "[codex] body"
+    assert len(calls) == 1
+    assert entry.read_text(encoding="utf-8") == "[codex] body"
+
+
+def test_render_cache_bounds_memory_by_characters(calls):
+    cache = RenderCache(max_chars=20)
+
+    cache.render("x" * 20, "codex")
+    cache.render("x" * 20, "codex")
+    cache.render("short", "codex")
+    cache.render("short", "codex")
+
+    assert len(calls) == 3
+    assert cache.hits == 1
+
+
+def test_render_cache_skips_parts_of_split_sections(calls):
+    cache = RenderCache()
+    source = ["## Huge\n", *(f"line {index}\n" for index in range(6)), "## Small\n", "body\n"]
+
+    for _ in range(2):
+        stream_markdown_sections(
+            source,
+            io.StringIO(),
+            max_buffer_chars=20,
+            render=lambda section, complete: cache.render(section, "codex", cacheable=complete),
+        )
+
+    assert calls.count(("## Small\nbody\n", "codex")) == 1
+    assert len(calls) == 9
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_render_cache_evicts_oldest_disk_entries_past_max_bytes(tmp_path, calls):
+    cache = RenderCache(directory=tmp_path, max_bytes=25)
+
+    for section in ("first", "second", "third"):
+        cache.render(section, "codex")
+
+    sizes = [entry.stat().st_size for entry in tmp_path.glob("*.section")]
+    assert sum(sizes) <= 25
+    assert (tmp_path / f"{cache.key_for('third', 'codex')}.section").exists()
@@ -1,6 +1,9 @@
 import io
+import os
+import threading
+import time
 
-from src.renderer.streaming import stream_markdown_files, stream_markdown_sections
+from src.renderer.streaming import FlushPolicy, stream_markdown_files, stream_markdown_sections
 
 
 class RecordingTarget:
@@ -18,6 +21,16 @@ class RecordingTarget:
         return self._buffer.getvalue()
 
 
+class RecordingWrites(RecordingTarget):
+    def __init__(self) -> None:
+        super().__init__()
+        self.writes = []
+
+    def write(self, text: str) -> int:
+        self.writes.append(text)
+        return super().write(text)
+
+
 def test_stream_markdown_sections_flushes_per_heading_section():
     source_text = (
         "Intro line\n"
@@ -52,3 +65,157 @@ def test_stream_markdown_files_wraps_each_file_with_markers():
         target.getvalue() == "BEGIN FILE ONE.md\n## Section\nContent A\nEND FILE ONE.md\n"
         "BEGIN FILE TWO.md\nIntro\n## Section\nContent B\nEND FILE TWO.md\n"
     )
+
+
+MANY_SECTIONS = "".join(f"## Section {index}\nBody {index}\n" for index in range(10))
+
+
+def test_stream_markdown_sections_at_end_policy_flushes_once():
+    target = RecordingTarget()
+
+    stream_markdown_sections(io.StringIO(MANY_SECTIONS), target, flush_policy=FlushPolicy.at_end())
+
+    assert target.getvalue() == MANY_SECTIONS
+    assert target.flush_count == 1
+
+
+def test_stream_markdown_sections_coalesces_by_size():
+    target = RecordingTarget()
+    section_size = len("## Section 0\nBody 0\n")
+
+    stream_markdown_sections(
+        io.StringIO(MANY_SECTIONS),
+        target,
+        flush_policy=FlushPolicy(every_chars=section_size * 4),
+    )
+
+    assert target.getvalue() == MANY_SECTIONS
+    assert target.flush_count == 3
+
+
+def test_stream_markdown_sections_coalesces_by_interval():
+    target = RecordingTarget()
+    ticks = iter(range(0, 10_000, 30))
+
+    stream_markdown_sections(
+        io.StringIO(MANY_SECTIONS),
+        target,
+        flush_policy=FlushPolicy(every_ms=50_000),
+        now_fn=lambda: next(ticks),
+    )
+
+    assert target.flush_count == 5
+
+
+def test_flush_policy_defaults_by_target_type(tmp_path):
+    read_fd, write_fd = os.pipe()
+    try:
+        with open(write_fd, "w", closefd=False) as pipe_target:
+            pipe_policy = FlushPolicy.for_target(pipe_target)
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+    with open(tmp_path / "out.md", "w", encoding="utf-8") as file_target:
+        file_policy = FlushPolicy.for_target(file_target)
+
+    assert FlushPolicy.for_target(RecordingTarget()) == FlushPolicy.per_section()
+    assert file_policy == FlushPolicy.at_end()
+    assert pipe_policy.every_section is False
+    assert pipe_policy.every_chars is not None
+    assert pipe_policy.every_ms is not None
+
+
+def _slow_lines(text: str, delay: float):
+    time.sleep(delay)
+    yield from text.splitlines(keepends=True)
+
+
+def test_stream_markdown_files_with_workers_keeps_input_order():
+    contents = [f"# File {index}\nBody {index}\n## Part\nMore {index}\n" for index in range(8)]
+    files = [
+        (f"file-{index}.md", _slow_lines(text, 0.02 if index % 3 == 0 else 0.0))
+        for index, text in enumerate(contents)
+    ]
+    expected = RecordingTarget()
+    stream_markdown_files(
+        [(f"file-{index}.md", io.StringIO(text)) for index, text in enumerate(contents)], expected
+    )
+    target = RecordingTarget()
+
+    stream_markdown_files(files, target, workers=4)
+
+    assert target.getvalue() == expected.getvalue()
+
+
+def test_stream_markdown_files_bounds_files_read_ahead():
+    pulled = []
+    pulled_at_header = []
+
+    class HeaderTarget(RecordingTarget):
+        def write(self, text: str) -> int:
+            if text.startswith("BEGIN FILE"):
+                pulled_at_header.append(len(pulled))
+            return super().write(text)
+
+    def files():
+        for index in range(20):
+            pulled.append(index)
+            yield f"file-{index}.md", _slow_lines(f"# {index}\n", 0.05 if index == 0 else 0.0)
+
+    stream_markdown_files(files(), HeaderTarget(), workers=2, max_pending=3)
+
+    assert all(count <= index + 4 for index, count in enumerate(pulled_at_header))
+
+
+def test_stream_markdown_files_with_workers_reads_sources_concurrently():
+    barrier = threading.Barrier(4, timeout=5)
+
+    def blocking_lines(index: int):
+        barrier.wait()
+        yield f"# File {index}\n"
+
+    target = RecordingTarget()
+
+    stream_markdown_files(
+        [(f"file-{index}.md", blocking_lines(index)) for index in range(4)], target, workers=4
+    )
+
+    assert target.getvalue().count("BEGIN FILE") == 4
+
+
+def test_stream_markdown_files_with_workers_applies_buffer_limit():
+    lines = [f"line {index:04d}\n" for index in range(100)]
+    target = RecordingWrites()
+
+    stream_markdown_files(
+        [("a.md", iter(lines)), ("b.md", iter(lines))], target, workers=2, max_buffer_chars=100
+    )
+
+    body_writes = [text for text in target.writes if not text.startswith(("BEGIN", "END"))]
+    assert "".join(body_writes) == "".join(lines) * 2
+    assert max(len(text) for text in body_writes) <= 100
+
+
+def test_stream_markdown_sections_splits_sections_over_buffer_limit():
+    code_lines = [f"line {index:04d}\n" for index in range(100)]
+    source_text = "## Small\nbody\n## Huge\n```\n" + "".join(code_lines) + "```\n## Tail\nend\n"
+    target = RecordingWrites()
+
+    stream_markdown_sections(
+        io.StringIO(source_text), target, flush_policy=FlushPolicy.at_end(), max_buffer_chars=100
+    )
+
+    assert target.getvalue() == source_text
+    assert target.writes[0] == "## Small\nbody\n"
+    assert target.writes[-1] == "## Tail\nend\n"
+    assert max(len(text) for text in target.writes) <= 100
+    assert len(target.writes) > 10
+
+
+def test_stream_markdown_sections_buffer_limit_keeps_single_long_line_whole():
+    target = RecordingTarget()
+    long_line = "x" * 50 + "\n"
+
+    stream_markdown_sections([long_line, "short\n"], target, max_buffer_chars=10)
+
+    assert target.getvalue() == long_line + "short\n"